@@ -1,13 +1,15 @@
 import streamlit as st
+import pandas as pd
 import sys
 import os
+import time
 
 sys.path.insert(0, os.path.abspath("src"))
 
-from text_extraction import extract_text_from_pdf
-from preprocessing import clean_text, extract_keywords_from_both
-from similarity import calculate_combined_score
-from scorer import score_resume, get_score_category, generate_feedback, get_recommendations
+from extraction_sandbox import ExtractionPool
+from score_cache import ScoreCache
+from pipeline import BackgroundPipeline, analyze_resume_cached, make_score_executor, _write_temp_pdf, _remove_file
+from scorer import generate_feedback, get_recommendations
 
 st.set_page_config(
     page_title="AI Resume Screener", 
@@ -15,19 +17,129 @@ st.set_page_config(
     layout="wide"
 )
 
+
+@st.cache_resource
+def get_extraction_pool():
+    """Sandboxed extraction workers shared across sessions"""
+    return ExtractionPool()
+
+
+@st.cache_resource
+def get_score_executor():
+    """Scoring processes shared by every batch job; restarted if one dies"""
+    return make_score_executor()
+
+
+@st.cache_resource
+def get_score_cache():
+    """Persistent score cache shared across sessions"""
+    return ScoreCache()
+
+
+def batch_results_table(items):
+    """Ranked table rows for finished batch items, best match first"""
+    rows = []
+    for item in items:
+        result = item['result']
+        if result:
+            scores = result['scores']
+            rows.append({
+                "Resume": item['name'],
+                "Match Score (%)": result['final_score'],
+                "Category": f"{result['emoji']} {result['category']}",
+                "Semantic (%)": round(scores['tfidf_score'] * 100, 1),
+                "Keywords (%)": round(scores['keyword_score'] * 100, 1),
+                "Keywords Matched": f"{scores['matching_count']}/{scores['total_jd_keywords']}",
+                "Error": ""
+            })
+        else:
+            rows.append({"Resume": item['name'], "Match Score (%)": None, "Error": item['error']})
+    
+    table = pd.DataFrame(rows)
+    if not table.empty:
+        table = table.sort_values("Match Score (%)", ascending=False, na_position="last")
+        # Failed resumes are listed last without a rank
+        scored = int(table["Match Score (%)"].notna().sum())
+        ranks = list(range(1, scored + 1)) + [None] * (len(table) - scored)
+        table.insert(0, "Rank", pd.array(ranks, dtype="Int64"))
+    return table
+
+
+def render_batch_results(job):
+    """Progressive ranked table while scoring runs, then per-candidate details"""
+    st.markdown("---")
+    st.markdown("### 📋 Ranked Candidates")
+    
+    progress = st.empty()
+    table = st.empty()
+    
+    while True:
+        done = job.done
+        items = job.snapshot()
+        progress.progress(
+            len(items) / job.total if job.total else 1.0,
+            text=f"Scored {len(items)} of {job.total} resumes"
+        )
+        table.dataframe(batch_results_table(items), use_container_width=True, hide_index=True)
+        if done:
+            break
+        time.sleep(0.5)
+    
+    if job.error:
+        st.error(f" Batch scoring failed: {job.error}")
+    
+    # Details are rendered once scoring finishes; feedback markdown is only
+    # generated for candidates the recruiter opens, and kept for reruns
+    feedback_cache = st.session_state.setdefault('batch_feedback', {})
+    finished = sorted(
+        (item for item in items if item['result']),
+        key=lambda item: item['result']['final_score'],
+        reverse=True
+    )
+    
+    for item in finished:
+        result = item['result']
+        with st.expander(f"{result['emoji']} {item['name']} — {result['final_score']}% ({result['category']})"):
+            for rec in get_recommendations(result['final_score'], result['scores']):
+                st.markdown(rec)
+            
+            if st.checkbox("Show detailed feedback", key=f"batch_feedback_{item['index']}"):
+                if item['index'] not in feedback_cache:
+                    feedback_cache[item['index']] = generate_feedback(
+                        result['scores'], result['matching'], result['missing']
+                    )
+                st.markdown(feedback_cache[item['index']])
+
+
 st.title(" AI Resume Screener")
 st.markdown("### Analyze how well your resume matches a job description")
 st.markdown("---")
 
+batch_mode = st.radio(
+    "Mode",
+    ["Single resume", "Batch screening"],
+    horizontal=True,
+    help="Batch screening ranks several resumes against the same job description"
+) == "Batch screening"
+
 col1, col2 = st.columns(2)
 
 with col1:
-    st.subheader("📎 Upload Your Resume")
-    resume_file = st.file_uploader(
-        "Upload Resume (PDF)", 
-        type=["pdf"],
-        help="Upload your resume in PDF format"
-    )
+    if batch_mode:
+        st.subheader("📎 Upload Resumes")
+        resume_files = st.file_uploader(
+            "Upload Resumes (PDF)", 
+            type=["pdf"],
+            accept_multiple_files=True,
+            help="Upload all resumes to screen against this job description"
+        )
+    else:
+        st.subheader("📎 Upload Your Resume")
+        resume_file = st.file_uploader(
+            "Upload Resume (PDF)", 
+            type=["pdf"],
+            help="Upload your resume in PDF format"
+        )
 
 with col2:
     st.subheader(" Job Description")
@@ -48,7 +160,32 @@ analyze_button = st.button(
     use_container_width=True
 )
 
-if analyze_button:
+if analyze_button and batch_mode:
+    if not resume_files:
+        st.error(" Please upload at least one resume")
+    elif not jd_text or len(jd_text.strip()) < 100:
+        st.error(" Please paste a complete job description (minimum 100 characters)")
+    else:
+        # A new analysis replaces this session's previous job
+        previous = st.session_state.get('batch_job')
+        if previous is not None and not previous.done:
+            previous.cancel()
+        
+        # Read uploads here; the background worker must not touch Streamlit objects
+        resumes = [(f.name, f.getvalue()) for f in resume_files]
+        st.session_state['batch_job'] = BackgroundPipeline(
+            resumes,
+            jd_text,
+            extraction_pool=get_extraction_pool(),
+            score_executor=get_score_executor(),
+            cache=get_score_cache()
+        )
+        st.session_state['batch_feedback'] = {}
+
+if batch_mode and 'batch_job' in st.session_state:
+    render_batch_results(st.session_state['batch_job'])
+
+if analyze_button and not batch_mode:
     if not resume_file:
         st.error(" Please upload your resume")
     elif not jd_text or len(jd_text.strip()) < 100:
@@ -57,53 +194,43 @@ if analyze_button:
         with st.spinner(" Analyzing your resume..."):
             try:
            
-                temp_file = "temp_resume.pdf"
-                with open(temp_file, "wb") as f:
-                    f.write(resume_file.read())
+                # Unique temp file per upload, so concurrent sessions cannot overwrite each other's
+                temp_file = _write_temp_pdf(resume_file.getvalue())
+                try:
+                    extraction = get_extraction_pool().extract(temp_file)
+                finally:
+                    _remove_file(temp_file)
+                
+                if not extraction['ok']:
+                    st.error(f" Could not extract text from PDF: {extraction['error']['message']}")
+                    st.stop()
                 
-                resume_text = extract_text_from_pdf(temp_file)
+                resume_text = extraction['text']
                 
                 if not resume_text or len(resume_text.strip()) < 50:
                     st.error(" Could not extract text from PDF")
-                    os.remove(temp_file)
                     st.stop()
                 
                 if show_debug:
                     st.write(f"**Debug:** Extracted {len(resume_text)} chars, {len(resume_text.split())} words from resume")
                     st.write(f"**Debug:** JD has {len(jd_text)} chars, {len(jd_text.split())} words")
                 
-              
-                print("\n>>> Step 1: Extracting keywords from ORIGINAL text")
-                keyword_data = extract_keywords_from_both(resume_text, jd_text)
-                
-                if show_debug:
-                    st.write(f"**Debug:** Extracted {len(keyword_data['jd_keywords'])} JD keywords")
-                    st.write(f"**Debug:** Found {len(keyword_data['matching'])} matches")
-                    st.write(f"**Debug:** Sample JD keywords: {keyword_data['jd_keywords'][:10]}")
-                
-                
-                print("\n>>> Step 2: Cleaning text for TF-IDF")
-                resume_clean = clean_text(resume_text)
-                jd_clean = clean_text(jd_text)
-                
-                if show_debug:
-                    st.write(f"**Debug:** Cleaned resume: {len(resume_clean)} chars, {len(resume_clean.split())} words")
-                    st.write(f"**Debug:** Cleaned JD: {len(jd_clean)} chars, {len(jd_clean.split())} words")
-                    st.write(f"**Debug:** Resume sample: {resume_clean[:200]}")
-                
-               
-                if len(resume_clean.split()) < 20 or len(jd_clean.split()) < 20:
-                    st.error("❌ Text cleaning removed too much content!")
-                    st.write(f"Resume words: {len(resume_clean.split())}, JD words: {len(jd_clean.split())}")
+                # Same keywords -> clean -> score steps and cache handling as batch mode
+                try:
+                    result, from_cache = analyze_resume_cached(resume_text, jd_text, get_score_cache())
+                except ValueError as e:
+                    st.error(f"❌ {e}")
                     st.stop()
                 
+                scores = result['scores']
+                keyword_data = {'matching': result['matching'], 'missing': result['missing']}
+                final_score = result['final_score']
+                category, emoji = result['category'], result['emoji']
                 
-                print("\n>>> Step 3: Calculating similarity with CLEANED text")
-                scores = calculate_combined_score(resume_clean, jd_clean, keyword_data)
-            
-                
-                final_score = score_resume(scores['combined_score'])
-                category, emoji = get_score_category(final_score)
+                if show_debug:
+                    if from_cache:
+                        st.write(f"**Debug:** Loaded scores from cache ({get_score_cache().config_version})")
+                    st.write(f"**Debug:** Found {len(keyword_data['matching'])} matches for {scores['total_jd_keywords']} JD keywords")
                 
               
                 st.success("✅ Analysis Complete!")
@@ -175,10 +302,6 @@ if analyze_button:
                     st.markdown("###  Recommendations")
                     for rec in recommendations:
                         st.markdown(rec)
-                
-           
-                if os.path.exists(temp_file):
-                    os.remove(temp_file)
                     
             except Exception as e:
                 st.error(f" An error occurred: {str(e)}")
@@ -186,9 +309,6 @@ if analyze_button:
                 if show_debug:
                     import traceback
                     st.code(traceback.format_exc())
-                
-                if os.path.exists("temp_resume.pdf"):
-                    os.remove("temp_resume.pdf")
 
 
 with st.sidebar:
@@ -200,6 +320,8 @@ with st.sidebar:
     3. Calculates semantic similarity
     4. Combines both for final score
     
+    **Batch screening:** upload several resumes to get a ranked table that fills in as each one is scored.
+    
     **Score Guide:**
     - 70%+: Exceptional 
     - 60-70%: Strong 
@@ -0,0 +1,225 @@
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import CountVectorizer
+
+from similarity import SCORING_CONFIG, calculate_similarity
+
+# idf of a term found in only one of the two documents, as TfidfVectorizer
+# computes it (smooth_idf, n=2, df=1); terms in both documents get idf 1
+ONE_SIDED_IDF = np.log(3 / 2) + 1
+
+
+def two_document_idf_applies(tfidf_config):
+    """
+    True when TF-IDF settings match the closed form used here and in shortlist
+
+    calculate_similarity fits a fresh vectorizer on just (resume, JD), so with
+    these settings every term's idf is 1 or ONE_SIDED_IDF and per-pair
+    cosines can be computed from raw counts.
+    """
+    return bool(
+        tfidf_config.get('sublinear_tf') and
+        tfidf_config.get('norm', 'l2') == 'l2' and
+        tfidf_config.get('use_idf', True) and
+        tfidf_config.get('smooth_idf', True) and
+        tfidf_config.get('min_df', 1) == 1 and
+        tfidf_config.get('max_df', 1.0) == 1.0 and
+        tfidf_config.get('max_features') is None
+    )
+
+
+def batch_tfidf_similarity(resume_texts, jd_text):
+    """
+    calculate_similarity(resume, jd_text) for many resumes as one sparse block
+
+    Counts for the whole chunk come from one CountVectorizer pass; the
+    2-document idf and l2 normalisation of every pair are then applied
+    with sparse matrix-vector products. Matches calculate_similarity up to
+    float rounding, and a resume's score does not depend on which chunk it
+    is in. Falls back to the per-pair loop for TF-IDF settings the closed
+    form does not cover.
+    """
+    tfidf_config = SCORING_CONFIG['tfidf']
+    num_resumes = len(resume_texts)
+
+    if not two_document_idf_applies(tfidf_config):
+        return np.array([calculate_similarity(text, jd_text) for text in resume_texts])
+
+    if num_resumes == 0 or not jd_text:
+        return np.zeros(num_resumes)
+
+    vectorizer = CountVectorizer(
+        lowercase=tfidf_config.get('lowercase', True),
+        token_pattern=tfidf_config['token_pattern'],
+        ngram_range=tfidf_config['ngram_range']
+    )
+    try:
+        counts = vectorizer.fit_transform(list(resume_texts) + [jd_text]).tocsr()
+    except ValueError:
+        # Empty vocabulary: nothing survived tokenization
+        return np.zeros(num_resumes)
+
+    # Column order is alphabetical but rows keep vocabulary-growth order;
+    # sorting makes each row's sums independent of the rest of the chunk
+    counts.sort_indices()
+    resumes = counts[:num_resumes].astype(np.float64)
+    jd = counts[num_resumes].toarray().ravel().astype(np.float64)
+
+    # Sublinear tf: 1 + log(tf) on non-zero counts
+    resumes.data = 1 + np.log(resumes.data)
+    jd_present = jd > 0
+    jd[jd_present] = 1 + np.log(jd[jd_present])
+
+    presence = resumes.copy()
+    presence.data[:] = 1.0
+    squared = resumes.multiply(resumes).tocsr()
+    squared.sort_indices()
+    jd_squared = jd ** 2
+    one_sided_idf2 = ONE_SIDED_IDF ** 2
+
+    # Shared terms have idf 1, so only they contribute to the dot product
+    dot = resumes @ jd
+    resume_shared = squared @ jd_present.astype(np.float64)
+    resume_only = squared @ (~jd_present).astype(np.float64)
+    jd_shared = presence @ jd_squared
+    jd_only = jd_squared[jd_present].sum() - jd_shared
+
+    resume_norm = np.sqrt(resume_shared + one_sided_idf2 * resume_only)
+    jd_norm = np.sqrt(jd_shared + one_sided_idf2 * jd_only)
+    denominator = resume_norm * jd_norm
+
+    similarity = np.zeros(num_resumes)
+    nonzero = denominator > 0
+    similarity[nonzero] = dot[nonzero] / denominator[nonzero]
+
+    empty = np.array([not text for text in resume_texts], dtype=bool)
+    similarity[empty] = 0.0
+    return similarity
+
+
+def keyword_match_matrix(matching_lists, jd_keywords):
+    """
+    Sparse boolean resumes × JD-keywords matrix
+
+    Row i has a True in column j when jd_keywords[j] is in matching_lists[i].
+    Matching lists come from extract_keywords_from_both, so each is a subset
+    of jd_keywords without duplicates and row sums equal len(matching).
+    """
+    column = {kw: j for j, kw in enumerate(jd_keywords)}
+    rows = []
+    cols = []
+
+    for i, matching in enumerate(matching_lists):
+        for kw in matching:
+            j = column.get(kw)
+            if j is not None:
+                rows.append(i)
+                cols.append(j)
+
+    data = np.ones(len(rows), dtype=bool)
+    return sparse.csr_matrix(
+        (data, (rows, cols)),
+        shape=(len(matching_lists), len(jd_keywords)),
+        dtype=bool
+    )
+
+
+def batch_keyword_components(match_matrix, jd_keywords):
+    """
+    Basic and phrase-length-weighted match rates for every resume
+
+    Returns (matched_counts, basic_rates, weighted_rates) as arrays.
+    """
+    num_resumes = match_matrix.shape[0]
+
+    if not jd_keywords:
+        zeros = np.zeros(num_resumes)
+        return np.zeros(num_resumes, dtype=np.int64), zeros, zeros
+
+    # Single words = 1, phrases = 2+
+    weights = np.array([len(kw.split()) for kw in jd_keywords], dtype=np.int64)
+    matches = match_matrix.astype(np.int64)
+
+    matched_counts = np.asarray(matches.sum(axis=1)).ravel()
+    weighted_sums = matches @ weights
+
+    # Integer sums divided once, exactly like the scalar path
+    basic_rates = matched_counts / len(jd_keywords)
+    weighted_rates = weighted_sums / weights.sum()
+
+    return matched_counts, basic_rates, weighted_rates
+
+
+def combine_keyword_rates(matched_counts, basic_rates, weighted_rates):
+    """Final keyword score from its components, as in calculate_keyword_match"""
+    return np.where(matched_counts > 0, (basic_rates + weighted_rates) / 2, basic_rates)
+
+
+def batch_keyword_scores(match_matrix, jd_keywords):
+    """Vectorized calculate_keyword_match over all rows of match_matrix"""
+    return combine_keyword_rates(*batch_keyword_components(match_matrix, jd_keywords))
+
+
+def batch_weights(num_keywords, config=None):
+    """Vectorized get_weights: (tfidf_weights, keyword_weights) arrays"""
+    config = config or SCORING_CONFIG
+    num_keywords = np.asarray(num_keywords)
+
+    conditions = [num_keywords >= min_keywords for min_keywords, _, _ in config['weight_tiers']]
+    tfidf_weights = np.select(conditions, [t for _, t, _ in config['weight_tiers']], default=np.nan)
+    keyword_weights = np.select(conditions, [k for _, _, k in config['weight_tiers']], default=np.nan)
+
+    return tfidf_weights, keyword_weights
+
+
+def batch_boosts(tfidf_scores, keyword_scores, config=None):
+    """Vectorized get_boost: first satisfied rule wins, 0 otherwise"""
+    config = config or SCORING_CONFIG
+
+    conditions = [
+        (tfidf_scores >= min_tfidf) & (keyword_scores >= min_keyword)
+        for min_tfidf, min_keyword, _, _ in config['boost_rules']
+    ]
+    return np.select(conditions, [boost for _, _, boost, _ in config['boost_rules']], default=0.0)
+
+
+def batch_combined_scores(tfidf_scores, keyword_scores, num_keywords, config=None):
+    """
+    Vectorized weighting and boosting from calculate_combined_score
+
+    num_keywords may be a single JD keyword count or one count per row.
+    Returns (combined_scores, boosts).
+    """
+    tfidf_scores = np.asarray(tfidf_scores, dtype=np.float64)
+    keyword_scores = np.asarray(keyword_scores, dtype=np.float64)
+
+    tfidf_weights, keyword_weights = batch_weights(num_keywords, config)
+    base_scores = (tfidf_scores * tfidf_weights) + (keyword_scores * keyword_weights)
+    boosts = batch_boosts(tfidf_scores, keyword_scores, config)
+
+    return np.minimum(base_scores + boosts, 1.0), boosts
+
+
+def batch_score(tfidf_scores, matching_lists, jd_keywords):
+    """
+    Score a batch of resumes against one JD
+
+    tfidf_scores holds calculate_similarity results for each resume, and
+    matching_lists the 'matching' keyword lists from extract_keywords_from_both.
+    Gives the same numbers as calling calculate_combined_score once per resume
+    (for non-empty texts), returned as arrays keyed like its result dict.
+    """
+    match_matrix = keyword_match_matrix(matching_lists, jd_keywords)
+    keyword_scores = batch_keyword_scores(match_matrix, jd_keywords)
+    tfidf_scores = np.asarray(tfidf_scores, dtype=np.float64)
+
+    combined_scores, boosts = batch_combined_scores(tfidf_scores, keyword_scores, len(jd_keywords))
+
+    return {
+        'tfidf_score': tfidf_scores,
+        'keyword_score': keyword_scores,
+        'combined_score': combined_scores,
+        'matching_count': np.asarray(match_matrix.sum(axis=1)).ravel(),
+        'total_jd_keywords': len(jd_keywords),
+        'boost_applied': boosts
+    }
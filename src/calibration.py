@@ -0,0 +1,204 @@
+import argparse
+import copy
+import itertools
+import time
+
+import numpy as np
+
+from batch_scoring import batch_combined_scores, combine_keyword_rates
+from feature_store import FeatureStore
+from similarity import SCORING_CONFIG, scoring_config_version
+
+# Grid used by the command line tool; values around the current config
+DEFAULT_GRID = {
+    'tfidf_weights': [(0.50, 0.55, 0.60), (0.55, 0.60, 0.65), (0.60, 0.65, 0.70)],
+    'cutoffs': [(60, 40), (50, 30), (40, 20)],
+    'boosts': [(0.0, 0.0, 0.0), (0.05, 0.03, 0.02), (0.08, 0.05, 0.03)],
+}
+
+
+def make_config(tfidf_weights=None, cutoffs=None, boosts=None, boost_thresholds=None, base=None):
+    """
+    Derive a scoring config from base (SCORING_CONFIG by default)
+
+    tfidf_weights - TF-IDF weight per tier; keyword weight is 1 - weight
+    cutoffs       - minimum JD keyword counts for all tiers but the last
+    boosts        - boost amount per boost rule
+    boost_thresholds - (min TF-IDF, min keyword score) per boost rule
+    """
+    config = copy.deepcopy(base or SCORING_CONFIG)
+    tiers = config['weight_tiers']
+    rules = config['boost_rules']
+
+    if tfidf_weights is not None:
+        tiers = [(cutoff, w, round(1 - w, 10)) for (cutoff, _, _), w in zip(tiers, tfidf_weights)]
+    if cutoffs is not None:
+        tiers = [(cutoff, t, k) for cutoff, (_, t, k) in zip(list(cutoffs) + [0], tiers)]
+    if boosts is not None:
+        rules = [(t, k, boost, reason) for (t, k, _, reason), boost in zip(rules, boosts)]
+    if boost_thresholds is not None:
+        rules = [(t, k, boost, reason) for (t, k), (_, _, boost, reason) in zip(boost_thresholds, rules)]
+
+    config['weight_tiers'] = tiers
+    config['boost_rules'] = rules
+    return config
+
+
+def config_grid(grid):
+    """Yield (params, config) for every combination in {param: [values]}"""
+    names = list(grid)
+    for values in itertools.product(*(grid[name] for name in names)):
+        params = dict(zip(names, values))
+        yield params, make_config(**params)
+
+
+class CalibrationSet:
+    """
+    Labelled pairs prepared for fast repeated evaluation
+
+    Rows are grouped once, and everything that does not depend on the
+    scoring config (keyword scores, group offsets, ideal DCG) is
+    precomputed, so evaluating a config is a handful of array operations
+    plus one sort.
+    """
+
+    def __init__(self, features, k=10):
+        order = np.argsort(features['group'], kind='stable')
+        self.k = k
+        self.groups = features['group'][order]
+        self.labels = features['label'][order]
+        self.tfidf_scores = features['tfidf_score'][order]
+        self.num_keywords = features['num_keywords'][order]
+        self.keyword_scores = combine_keyword_rates(
+            features['matching_count'][order],
+            features['basic_rate'][order],
+            features['weighted_rate'][order]
+        )
+
+        _, self.group_index, group_sizes = np.unique(
+            self.groups, return_inverse=True, return_counts=True
+        )
+        self.num_groups = len(group_sizes)
+        self.group_sizes = group_sizes
+
+        # Narrow group ids sort much faster (NumPy radix-sorts 16-bit ints)
+        self.group_index = self.group_index.astype(np.min_scalar_type(max(self.num_groups - 1, 0)))
+
+        # Rows are grouped, so a row's rank in its group is its offset from the group start
+        group_starts = np.cumsum(group_sizes) - group_sizes
+        self._group_starts = np.repeat(group_starts, group_sizes)
+
+        self.positive = self.labels > 0
+        self.ideal_dcg = self._dcg(*self._rank_within_groups(self.labels)[:3])
+
+    def _rank_within_groups(self, values):
+        """
+        Order rows by value within each group, highest first
+
+        Returns (order, ranks, in_top_k, order_by_value) where order_by_value
+        is the global descending order it was derived from. Both sorts are
+        stable, so ties keep stored order.
+        """
+        order_by_value = np.argsort(-values, kind='stable')
+        order = order_by_value[np.argsort(self.group_index[order_by_value], kind='stable')]
+        ranks = np.arange(len(order)) - self._group_starts
+        return order, ranks, ranks < self.k, order_by_value
+
+    def _per_group_sum(self, order, values):
+        return np.bincount(self.group_index[order], weights=values, minlength=self.num_groups)
+
+    def _dcg(self, order, ranks, in_top_k):
+        gains = (2.0 ** self.labels[order] - 1) / np.log2(ranks + 2)
+        return self._per_group_sum(order, gains * in_top_k)
+
+    def _auc(self, scores, order_by_value):
+        """Mann-Whitney AUC with tied scores sharing their average rank"""
+        num_pos = int(self.positive.sum())
+        num_neg = len(scores) - num_pos
+        if not (num_pos and num_neg):
+            return float('nan')
+
+        # Ascending ranks 1..n, averaged over runs of equal scores
+        ordered = scores[order_by_value[::-1]]
+        run_starts = np.flatnonzero(np.concatenate(([True], ordered[1:] != ordered[:-1])))
+        run_ends = np.append(run_starts[1:], len(ordered))
+        run_ranks = (run_starts + 1 + run_ends) / 2
+        ranks = np.repeat(run_ranks, run_ends - run_starts)
+
+        positive_rank_sum = ranks[self.positive[order_by_value[::-1]]].sum()
+        return (positive_rank_sum - num_pos * (num_pos + 1) / 2) / (num_pos * num_neg)
+
+    def evaluate(self, config=None):
+        """Score all pairs under config and return ranking metrics"""
+        scores, _ = batch_combined_scores(self.tfidf_scores, self.keyword_scores, self.num_keywords, config)
+
+        order, ranks, in_top_k, order_by_value = self._rank_within_groups(scores)
+        hits = self._per_group_sum(order, self.positive[order] & in_top_k)
+        precision = hits / np.minimum(self.group_sizes, self.k)
+
+        has_relevant = self.ideal_dcg > 0
+        ndcg = self._dcg(order, ranks, in_top_k)[has_relevant] / self.ideal_dcg[has_relevant]
+        auc = self._auc(scores, order_by_value)
+
+        return {
+            'auc': float(auc),
+            'precision_at_k': float(precision.mean()) if self.num_groups else float('nan'),
+            'ndcg_at_k': float(ndcg.mean()) if len(ndcg) else float('nan'),
+            'mean_score': float(scores.mean()) if len(scores) else float('nan')
+        }
+
+
+def sweep(features, grid, k=10, metric='ndcg_at_k'):
+    """
+    Evaluate every config in grid over stored features
+
+    Returns one dict per config (params, config_version and metrics),
+    best first by metric.
+    """
+    calibration_set = CalibrationSet(features, k=k)
+    results = []
+
+    for params, config in config_grid(grid):
+        metrics = calibration_set.evaluate(config)
+        results.append({
+            'params': params,
+            'config_version': scoring_config_version(config),
+            **metrics
+        })
+
+    results.sort(key=lambda r: np.nan_to_num(r[metric], nan=-np.inf), reverse=True)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Grid-search scoring weights and thresholds over a feature store")
+    parser.add_argument("store", help="Feature store directory")
+    parser.add_argument("--k", type=int, default=10, help="Cutoff for precision@k and NDCG@k")
+    parser.add_argument("--metric", default="ndcg_at_k", choices=["ndcg_at_k", "precision_at_k", "auc"])
+    parser.add_argument("--top", type=int, default=10, help="Number of configs to report")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    try:
+        features = FeatureStore(args.store).load()
+    except FileNotFoundError as e:
+        parser.error(str(e))
+    if not len(features['group']):
+        parser.error(f"Feature store {args.store} has no pairs")
+    print(f"Loaded {len(features['group'])} pairs in {time.perf_counter() - start:.2f}s")
+
+    baseline = CalibrationSet(features, k=args.k).evaluate()
+    print(f"Current config ({scoring_config_version()}): "
+          f"AUC={baseline['auc']:.4f}, P@{args.k}={baseline['precision_at_k']:.4f}, NDCG@{args.k}={baseline['ndcg_at_k']:.4f}")
+
+    start = time.perf_counter()
+    results = sweep(features, DEFAULT_GRID, k=args.k, metric=args.metric)
+    print(f"Evaluated {len(results)} configs in {time.perf_counter() - start:.2f}s\n")
+
+    for rank, result in enumerate(results[:args.top], 1):
+        print(f"{rank:2d}. AUC={result['auc']:.4f}  P@{args.k}={result['precision_at_k']:.4f}  "
+              f"NDCG@{args.k}={result['ndcg_at_k']:.4f}  {result['params']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,301 @@
+import atexit
+import multiprocessing
+import os
+import queue
+import resource
+import signal
+import threading
+import time
+
+from text_extraction import extract_text_from_pdf, PageLimitExceeded
+
+DEFAULT_TIMEOUT = 30              # seconds of wall-clock time per document
+DEFAULT_MAX_MEMORY_MB = 1024      # RLIMIT_AS for each worker and its page-range processes
+DEFAULT_MAX_PAGES = 250           # documents longer than this are rejected
+DEFAULT_MAX_TASKS_PER_WORKER = 50 # recycle workers periodically to cap leaks
+STARTUP_TIMEOUT = 60              # seconds a new worker may take to become ready
+
+
+def process_context():
+    """
+    multiprocessing context for pools started from a multithreaded process
+
+    A forked child inherits locks other threads were holding (the Streamlit
+    server's, stdout's), which can deadlock it; forkserver and spawn start
+    from a clean process instead. The fork server preloads this module
+    (and pdfplumber with it) so frequently respawned extraction workers do
+    not import it again; scoring modules are left out to keep the workers'
+    address space small. Children still re-run the main module's top-level
+    code, so scripts using these pools need the usual
+    `if __name__ == "__main__"` guard.
+    """
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        ctx = multiprocessing.get_context("forkserver")
+        ctx.set_forkserver_preload(["__main__", __name__])
+        return ctx
+    return multiprocessing.get_context("spawn")
+
+
+def _error(kind, message):
+    """Structured failure result returned instead of raising"""
+    return {
+        'ok': False,
+        'text': '',
+        'error': {'type': kind, 'message': message}
+    }
+
+
+def _worker_main(conn, max_memory_mb, max_pages, parallel_threshold, max_workers):
+    """
+    Worker loop: receive file paths, send back extraction results
+
+    Runs in its own process group so a timed-out worker can be killed
+    together with anything it started. Sends 'ready' once set up.
+    """
+    os.setpgrp()
+
+    if max_memory_mb:
+        limit = max_memory_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+    conn.send('ready')
+
+    while True:
+        try:
+            file_path = conn.recv()
+        except EOFError:
+            break
+
+        if file_path is None:
+            break
+
+        try:
+            text = extract_text_from_pdf(
+                file_path,
+                max_pages=max_pages,
+                parallel_threshold=parallel_threshold,
+                max_workers=max_workers
+            )
+            result = {'ok': True, 'text': text, 'error': None}
+        except PageLimitExceeded as e:
+            result = _error('page_limit', str(e))
+        except MemoryError:
+            result = _error('memory', f"Extraction exceeded the {max_memory_mb} MB memory limit")
+        except Exception as e:
+            result = _error('extraction', f"{type(e).__name__}: {e}")
+
+        conn.send(result)
+
+
+class _Worker:
+    """
+    One sandboxed extraction process and the parent end of its pipe
+
+    Waits for the process to report ready, so its startup time is never
+    counted against the first document's timeout. Raises RuntimeError if
+    it does not start.
+    """
+
+    def __init__(self, ctx, max_memory_mb, max_pages, parallel_threshold, max_workers):
+        self.conn, child_conn = ctx.Pipe()
+        # Not a daemon: large PDFs are extracted by page-range subprocesses,
+        # which daemonic processes may not start. ExtractionPool.close (run
+        # at exit) kills every worker instead, busy or not, since exit
+        # would otherwise wait on them.
+        self.process = ctx.Process(
+            target=_worker_main,
+            args=(child_conn, max_memory_mb, max_pages, parallel_threshold, max_workers),
+            daemon=False
+        )
+        self.process.start()
+        child_conn.close()
+        self.tasks = 0
+
+        try:
+            ready = self.conn.poll(STARTUP_TIMEOUT) and self.conn.recv() == 'ready'
+        except (EOFError, OSError):
+            ready = False
+        if not ready:
+            exitcode = self.process.exitcode
+            self.kill()
+            raise RuntimeError(f"Extraction worker failed to start (exit code {exitcode})")
+
+    def kill(self):
+        pid = self.process.pid
+        try:
+            # Only signal the group once the worker has become its leader,
+            # otherwise we would be signalling our own process group
+            if os.getpgid(pid) == pid:
+                os.killpg(pid, signal.SIGKILL)
+            else:
+                self.process.kill()
+        except (ProcessLookupError, PermissionError):
+            pass
+        self.process.join(timeout=5)
+        self.conn.close()
+
+    def stop(self):
+        try:
+            self.conn.send(None)
+        except (BrokenPipeError, OSError):
+            pass
+        self.process.join(timeout=1)
+        if self.process.is_alive():
+            self.kill()
+        else:
+            self.conn.close()
+
+
+class ExtractionPool:
+    """
+    Pool of sandboxed PDF extraction workers
+
+    Every document is extracted in a separate process with a hard wall-clock
+    timeout, an RLIMIT_AS memory cap and a page-count limit. Workers that time
+    out or die are killed and replaced, and the caller always gets a result
+    dict back instead of an exception or a hang:
+
+        {'ok': bool, 'text': str, 'error': None or {'type', 'message'}, 'elapsed': float}
+
+    Error types: 'timeout', 'page_limit', 'memory', 'crashed', 'extraction'.
+    The memory cap is per document: a worker extracting a large PDF in page
+    ranges splits its remaining headroom with the page-range processes.
+    parallel_threshold and max_workers are passed to extract_text_from_pdf
+    (page count that triggers the split, and page-range processes per
+    document); None uses the text_extraction defaults.
+    `extract` is thread-safe; concurrent callers share the workers.
+    """
+
+    def __init__(self, num_workers=2, timeout=DEFAULT_TIMEOUT,
+                 max_memory_mb=DEFAULT_MAX_MEMORY_MB, max_pages=DEFAULT_MAX_PAGES,
+                 max_tasks_per_worker=DEFAULT_MAX_TASKS_PER_WORKER,
+                 parallel_threshold=None, max_workers=None):
+        self.timeout = timeout
+        self.max_memory_mb = max_memory_mb
+        self.max_pages = max_pages
+        self.max_tasks_per_worker = max_tasks_per_worker
+        self.parallel_threshold = parallel_threshold
+        self.max_workers = max_workers
+        self._ctx = process_context()
+        self._idle = queue.Queue()
+        self._workers = set()  # idle and busy
+        self._lock = threading.Lock()
+        self._closed = False
+
+        for _ in range(num_workers):
+            self._idle.put(self._spawn())
+
+        atexit.register(self.close)
+
+    def _spawn(self):
+        worker = _Worker(
+            self._ctx, self.max_memory_mb, self.max_pages,
+            self.parallel_threshold, self.max_workers
+        )
+        with self._lock:
+            self._workers.add(worker)
+        return worker
+
+    def _retire(self, worker, kill=False):
+        """
+        Stop a worker and forget it
+
+        Returns a ready replacement, or None if the pool is closed or the
+        replacement failed to start.
+        """
+        with self._lock:
+            self._workers.discard(worker)
+        if kill:
+            worker.kill()
+        else:
+            worker.stop()
+        if self._closed:
+            return None
+        try:
+            return self._spawn()
+        except RuntimeError as e:
+            print(f"❌ ERROR: {e}")
+            return None
+
+    def extract(self, file_path):
+        """Extract text from one PDF inside a sandboxed worker"""
+        worker = None
+        while worker is None:
+            if self._closed:
+                raise RuntimeError("ExtractionPool is closed")
+            try:
+                worker = self._idle.get(timeout=1)
+            except queue.Empty:
+                continue
+        start = time.monotonic()
+
+        try:
+            worker.conn.send(file_path)
+
+            if worker.conn.poll(self.timeout):
+                result = worker.conn.recv()
+                worker.tasks += 1
+
+                # A MemoryError can leave the interpreter in a bad state
+                memory_hit = result['error'] is not None and result['error']['type'] == 'memory'
+                if memory_hit or worker.tasks >= self.max_tasks_per_worker:
+                    worker = self._retire(worker)
+            else:
+                print(f"⚠️ WARNING: Extraction of {file_path} timed out after {self.timeout}s, recycling worker")
+                worker = self._retire(worker, kill=True)
+                result = _error('timeout', f"Extraction exceeded the {self.timeout}s time limit")
+
+        except (EOFError, OSError):
+            # Hitting RLIMIT_AS inside native code usually kills the process
+            # outright rather than raising MemoryError. close() killing a
+            # busy worker ends up here too.
+            worker.process.join(timeout=1)
+            exitcode = worker.process.exitcode
+            if self._closed:
+                result = _error('crashed', "Extraction pool was closed during extraction")
+            else:
+                print(f"❌ ERROR: Extraction worker died on {file_path} (exit code {exitcode})")
+                result = _error('crashed', f"Extraction worker exited unexpectedly (exit code {exitcode})")
+            worker = self._retire(worker, kill=True)
+
+        finally:
+            if worker is not None:
+                if self._closed:
+                    self._retire(worker)
+                else:
+                    self._idle.put(worker)
+
+        result['elapsed'] = time.monotonic() - start
+        return result
+
+    def close(self):
+        """
+        Stop all workers
+
+        Idle workers are asked to exit; busy ones are killed with their
+        process group, and their extract() calls return a 'crashed' result.
+        """
+        self._closed = True
+        atexit.unregister(self.close)
+
+        idle = []
+        while True:
+            try:
+                idle.append(self._idle.get_nowait())
+            except queue.Empty:
+                break
+
+        with self._lock:
+            busy = self._workers.difference(idle)
+            self._workers.clear()
+
+        for worker in idle:
+            worker.stop()
+        for worker in busy:
+            worker.kill()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,139 @@
+import glob
+import os
+
+import numpy as np
+
+from preprocessing import clean_text, extract_keywords_from_both
+from similarity import calculate_similarity, keyword_match_components
+
+# group: requisition / JD id the pair belongs to (ranking metrics are per group)
+# label: hiring outcome for the pair (0 = rejected, higher = further in the process)
+FEATURE_COLUMNS = {
+    'group': np.int64,
+    'label': np.float64,
+    'tfidf_score': np.float64,
+    'basic_rate': np.float64,
+    'weighted_rate': np.float64,
+    'matching_count': np.int64,
+    'num_keywords': np.int64,
+}
+
+
+def compute_features(resume_text, jd_text):
+    """
+    Raw, config-independent scoring features for one resume/JD pair
+
+    Everything calculate_combined_score needs except the weights and
+    thresholds, so stored pairs can be re-scored under any configuration.
+    """
+    keyword_data = extract_keywords_from_both(resume_text, jd_text)
+
+    resume_clean = clean_text(resume_text)
+    jd_clean = clean_text(jd_text)
+
+    basic_rate, weighted_rate = keyword_match_components(
+        keyword_data['matching'],
+        keyword_data['jd_keywords']
+    )
+
+    return {
+        'tfidf_score': calculate_similarity(resume_clean, jd_clean),
+        'basic_rate': basic_rate,
+        'weighted_rate': weighted_rate,
+        'matching_count': len(keyword_data['matching']),
+        'num_keywords': len(keyword_data['jd_keywords'])
+    }
+
+
+class FeatureStore:
+    """
+    Columnar on-disk store of per-pair scoring features
+
+    Rows are buffered in memory and written as numbered .npz parts, one
+    array per column in FEATURE_COLUMNS. load() concatenates the parts
+    back into one array per column, ready for vectorized re-scoring. The
+    directory is created on the first write.
+    """
+
+    def __init__(self, path, buffer_size=100_000):
+        self.path = path
+        self.buffer_size = buffer_size
+        self._buffer = {name: [] for name in FEATURE_COLUMNS}
+
+    def _parts(self):
+        return sorted(glob.glob(os.path.join(self.path, "part-*.npz")))
+
+    def add(self, group, label, features):
+        """Buffer one pair's features (a dict from compute_features)"""
+        self._buffer['group'].append(group)
+        self._buffer['label'].append(label)
+        for name in FEATURE_COLUMNS:
+            if name not in ('group', 'label'):
+                self._buffer[name].append(features[name])
+
+        if len(self._buffer['group']) >= self.buffer_size:
+            self.flush()
+
+    def append(self, columns):
+        """Write a whole block of rows given as {column: array}"""
+        lengths = {len(columns[name]) for name in FEATURE_COLUMNS}
+        if len(lengths) != 1:
+            raise ValueError(f"Columns have different lengths: {sorted(lengths)}")
+
+        os.makedirs(self.path, exist_ok=True)
+        part = os.path.join(self.path, f"part-{len(self._parts()):05d}.npz")
+        np.savez(part, **{
+            name: np.asarray(columns[name], dtype=dtype)
+            for name, dtype in FEATURE_COLUMNS.items()
+        })
+
+    def flush(self):
+        if self._buffer['group']:
+            self.append(self._buffer)
+            self._buffer = {name: [] for name in FEATURE_COLUMNS}
+
+    def load(self, columns=None):
+        """Return {column: array} over all stored rows"""
+        self.flush()
+        if not os.path.isdir(self.path):
+            raise FileNotFoundError(f"Feature store not found: {self.path}")
+        columns = columns or list(FEATURE_COLUMNS)
+        chunks = {name: [] for name in columns}
+
+        for part in self._parts():
+            with np.load(part) as data:
+                for name in columns:
+                    chunks[name].append(data[name])
+
+        return {
+            name: np.concatenate(chunks[name]) if chunks[name] else np.empty(0, dtype=FEATURE_COLUMNS[name])
+            for name in columns
+        }
+
+    def __len__(self):
+        total = len(self._buffer['group'])
+        for part in self._parts():
+            with np.load(part) as data:
+                total += len(data['group'])
+        return total
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.flush()
+
+
+def build_feature_store(pairs, store):
+    """
+    Compute and store features for labelled pairs
+
+    pairs yields (group, label, resume_text, jd_text) tuples.
+    """
+    count = 0
+    for group, label, resume_text, jd_text in pairs:
+        store.add(group, label, compute_features(resume_text, jd_text))
+        count += 1
+    store.flush()
+    print(f"Feature store: wrote {count} pairs to {store.path}")
+    return count
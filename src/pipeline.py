@@ -0,0 +1,358 @@
+import asyncio
+import os
+import tempfile
+import threading
+from concurrent.futures import Executor, ThreadPoolExecutor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from extraction_sandbox import ExtractionPool, process_context
+from preprocessing import clean_text, extract_keywords_from_both
+from similarity import calculate_combined_score
+from scorer import build_result
+
+_DONE = object()
+
+
+def analyze_resume(resume_text, jd_text):
+    """
+    Score one extracted resume against a JD
+
+    Keywords from the ORIGINAL text, then cleaning, then combined scoring
+    on CLEANED text. Used by both the single-resume and batch flows in app.py.
+    Raises ValueError when there is not enough text to score.
+    """
+    if not resume_text or len(resume_text.strip()) < 50:
+        raise ValueError("Could not extract text from PDF")
+
+    keyword_data = extract_keywords_from_both(resume_text, jd_text)
+
+    resume_clean = clean_text(resume_text)
+    jd_clean = clean_text(jd_text)
+
+    if len(resume_clean.split()) < 20 or len(jd_clean.split()) < 20:
+        raise ValueError(
+            f"Text cleaning removed too much content "
+            f"(resume words: {len(resume_clean.split())}, JD words: {len(jd_clean.split())})"
+        )
+
+    scores = calculate_combined_score(resume_clean, jd_clean, keyword_data)
+    return build_result(scores, keyword_data['matching'], keyword_data['missing'])
+
+
+def cached_result(cache, resume_text, jd_text):
+    """analyze_resume result from a ScoreCache, or None on a miss or without a cache"""
+    if cache is None:
+        return None
+    cached = cache.get(resume_text, jd_text)
+    if cached is None:
+        return None
+    return build_result(cached['scores'], cached['matching'], cached['missing'])
+
+
+def store_result(cache, resume_text, jd_text, result):
+    """Save an analyze_resume result to a ScoreCache, if there is one"""
+    if cache is not None:
+        cache.put(resume_text, jd_text, result['scores'], result['matching'], result['missing'])
+
+
+def analyze_resume_cached(resume_text, jd_text, cache=None):
+    """
+    analyze_resume, reusing and filling a ScoreCache when one is given
+
+    Returns (result, from_cache).
+    """
+    result = cached_result(cache, resume_text, jd_text)
+    if result is not None:
+        return result, True
+
+    result = analyze_resume(resume_text, jd_text)
+    store_result(cache, resume_text, jd_text, result)
+    return result, False
+
+
+class ScoreExecutor(Executor):
+    """
+    Process pool for the score stage that replaces itself when broken
+
+    A ProcessPoolExecutor whose worker dies (OOM kill, segfault) rejects
+    every later task with BrokenProcessPool. Here the first submit after
+    that starts a fresh pool, so one bad resume cannot disable scoring for
+    everything that shares the pool.
+    """
+
+    def __init__(self, max_workers=None):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.restarts = 0
+        self._lock = threading.Lock()
+        self._executor = self._start()
+
+    def _start(self):
+        return ProcessPoolExecutor(max_workers=self.max_workers, mp_context=process_context())
+
+    def submit(self, fn, /, *args, **kwargs):
+        with self._lock:
+            try:
+                return self._executor.submit(fn, *args, **kwargs)
+            except BrokenProcessPool:
+                print("⚠️ WARNING: A scoring process died, starting a new score pool")
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = self._start()
+                self.restarts += 1
+                return self._executor.submit(fn, *args, **kwargs)
+
+    def shutdown(self, wait=True, *, cancel_futures=False):
+        with self._lock:
+            self._executor.shutdown(wait=wait, cancel_futures=cancel_futures)
+
+
+def make_score_executor(max_workers=None):
+    """Process pool for the score stage; can be shared by several pipelines"""
+    return ScoreExecutor(max_workers)
+
+
+def _write_temp_pdf(data):
+    fd, path = tempfile.mkstemp(suffix=".pdf", prefix="resume_")
+    with os.fdopen(fd, "wb") as f:
+        f.write(data)
+    return path
+
+
+def _remove_file(path):
+    if os.path.exists(path):
+        os.remove(path)
+
+
+async def _run_stage(stage_fn, in_queue, out_queue, concurrency, downstream):
+    """
+    Run `concurrency` copies of stage_fn between two bounded queues
+
+    Items that already carry an error skip the stage but are still passed
+    on, so every input produces exactly one output. Once all copies have
+    seen the end marker, `downstream` end markers are sent to the next stage.
+    """
+    async def worker():
+        while True:
+            item = await in_queue.get()
+            if item is _DONE:
+                return
+            if item['error'] is None:
+                try:
+                    await stage_fn(item)
+                except Exception as e:
+                    item['error'] = f"{type(e).__name__}: {e}"
+            await out_queue.put(item)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    for _ in range(downstream):
+        await out_queue.put(_DONE)
+
+
+async def stream_pipeline(resumes, jd_text, io_workers=4, extract_workers=2,
+                          score_workers=None, queue_size=8, extraction_pool=None,
+                          cache=None, score_executor=None):
+    """
+    Staged asynchronous screening pipeline
+
+    `resumes` is an iterable of (name, source) pairs where source is PDF
+    bytes, a file-like object with .read() (e.g. a Streamlit upload) or a
+    path to a PDF on disk. Stages, each with its own concurrency:
+
+        io       - read uploads and write temp files (thread executor)
+        extract  - sandboxed PDF extraction (ExtractionPool processes)
+        score    - keywords, cleaning and TF-IDF scoring (process pool)
+
+    Stages are connected by queues of `queue_size` items, so a slow stage
+    applies backpressure instead of letting work pile up in memory. With a
+    ScoreCache, previously scored resume/JD pairs skip the process pool.
+    extraction_pool and score_executor (see make_score_executor) may be
+    shared between runs; pools created here are shut down at the end.
+
+    Yields one dict per resume as soon as it finishes (completion order):
+        {'index', 'name', 'error', 'result'}
+    where result is the dict from analyze_resume, or None on failure.
+    """
+    loop = asyncio.get_running_loop()
+    score_workers = score_workers or os.cpu_count() or 1
+
+    io_executor = ThreadPoolExecutor(max_workers=io_workers)
+    # Threads here only wait on the sandboxed extraction processes
+    extract_executor = ThreadPoolExecutor(max_workers=extract_workers)
+
+    owns_executor = score_executor is None
+    if owns_executor:
+        score_executor = make_score_executor(score_workers)
+
+    owns_pool = extraction_pool is None
+    if owns_pool:
+        extraction_pool = ExtractionPool(num_workers=extract_workers)
+
+    write_queue = asyncio.Queue(maxsize=queue_size)
+    extract_queue = asyncio.Queue(maxsize=queue_size)
+    score_queue = asyncio.Queue(maxsize=queue_size)
+    results_queue = asyncio.Queue(maxsize=queue_size)
+
+    async def write_stage(item):
+        source = item.pop('source')
+        if isinstance(source, (str, os.PathLike)):
+            item['path'] = os.fspath(source)
+            return
+        if hasattr(source, 'read'):
+            source = await loop.run_in_executor(io_executor, source.read)
+        item['path'] = await loop.run_in_executor(io_executor, _write_temp_pdf, source)
+        item['temp'] = True
+
+    async def extract_stage(item):
+        try:
+            extraction = await loop.run_in_executor(
+                extract_executor, extraction_pool.extract, item['path']
+            )
+        finally:
+            if item.get('temp'):
+                await loop.run_in_executor(io_executor, _remove_file, item['path'])
+
+        if not extraction['ok']:
+            item['error'] = extraction['error']['message']
+        else:
+            item['resume_text'] = extraction['text']
+
+    async def score_stage(item):
+        resume_text = item.pop('resume_text')
+
+        # Same lookup as analyze_resume_cached, with only the miss sent to the process pool
+        item['result'] = cached_result(cache, resume_text, jd_text)
+        if item['result'] is not None:
+            return
+
+        try:
+            item['result'] = await loop.run_in_executor(
+                score_executor, analyze_resume, resume_text, jd_text
+            )
+        except BrokenProcessPool:
+            # A scoring process died, perhaps on another resume; the pool
+            # replaces itself on the next submit, so retry once
+            item['result'] = await loop.run_in_executor(
+                score_executor, analyze_resume, resume_text, jd_text
+            )
+        store_result(cache, resume_text, jd_text, item['result'])
+
+    async def feed():
+        try:
+            for index, (name, source) in enumerate(resumes):
+                await write_queue.put({
+                    'index': index, 'name': name, 'source': source,
+                    'error': None, 'result': None
+                })
+        except Exception:
+            # Still end the stages so the consumer is not left waiting;
+            # the error is re-raised from gather once the results drain
+            for _ in range(io_workers):
+                await write_queue.put(_DONE)
+            raise
+        for _ in range(io_workers):
+            await write_queue.put(_DONE)
+
+    tasks = [
+        asyncio.create_task(feed()),
+        asyncio.create_task(_run_stage(write_stage, write_queue, extract_queue, io_workers, extract_workers)),
+        asyncio.create_task(_run_stage(extract_stage, extract_queue, score_queue, extract_workers, score_workers)),
+        asyncio.create_task(_run_stage(score_stage, score_queue, results_queue, score_workers, 1)),
+    ]
+
+    try:
+        while True:
+            item = await results_queue.get()
+            if item is _DONE:
+                break
+            yield {
+                'index': item['index'],
+                'name': item['name'],
+                'error': item['error'],
+                'result': item['result']
+            }
+        await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if owns_executor:
+            score_executor.shutdown(wait=True, cancel_futures=True)
+        extract_executor.shutdown(wait=True, cancel_futures=True)
+        io_executor.shutdown(wait=True)
+        if owns_pool:
+            extraction_pool.close()
+
+
+def run_pipeline(resumes, jd_text, **stage_options):
+    """Blocking wrapper around stream_pipeline; returns results in input order"""
+    async def collect():
+        return [item async for item in stream_pipeline(resumes, jd_text, **stage_options)]
+
+    results = asyncio.run(collect())
+    return sorted(results, key=lambda item: item['index'])
+
+
+class BackgroundPipeline:
+    """
+    Run stream_pipeline on a background thread
+
+    Results are collected as they complete so a UI can poll snapshot()
+    while scoring continues. resumes must be a list so progress can be
+    reported against its length. cancel() stops the run early; results
+    finished before it are kept.
+    """
+
+    def __init__(self, resumes, jd_text, **stage_options):
+        self.total = len(resumes)
+        self.error = None
+        self.cancelled = False
+        self._results = []
+        self._lock = threading.Lock()
+        self._loop = None
+        self._task = None
+        self._thread = threading.Thread(
+            target=self._run, args=(resumes, jd_text, stage_options), daemon=True
+        )
+        self._thread.start()
+
+    def _run(self, resumes, jd_text, stage_options):
+        async def collect():
+            with self._lock:
+                self._loop = asyncio.get_running_loop()
+                self._task = asyncio.current_task()
+                if self.cancelled:
+                    return
+            async for item in stream_pipeline(resumes, jd_text, **stage_options):
+                with self._lock:
+                    self._results.append(item)
+
+        try:
+            asyncio.run(collect())
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            self.error = f"{type(e).__name__}: {e}"
+
+    def cancel(self):
+        """
+        Stop scoring without waiting
+
+        Queued work is dropped; a resume already being extracted or scored
+        finishes in the background before the run's pools shut down.
+        """
+        with self._lock:
+            self.cancelled = True
+            loop, task = self._loop, self._task
+        if task is not None:
+            try:
+                loop.call_soon_threadsafe(task.cancel)
+            except RuntimeError:
+                pass  # the run already finished and closed its loop
+
+    @property
+    def done(self):
+        return not self._thread.is_alive()
+
+    def snapshot(self):
+        """Results finished so far, in completion order"""
+        with self._lock:
+            return list(self._results)
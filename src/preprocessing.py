@@ -199,6 +199,25 @@ def smart_keyword_match(keyword, text):
     
     return False
 
+def match_keywords(resume_text, jd_keywords):
+    """
+    Split JD keywords into (matching, missing) for one resume
+    
+    Same matching as extract_keywords_from_both, without the diagnostics,
+    for callers that extract the JD keywords once and reuse them.
+    """
+    resume_lower = resume_text.lower()
+    matching = []
+    missing = []
+    
+    for keyword in jd_keywords:
+        if smart_keyword_match(keyword, resume_lower):
+            matching.append(keyword)
+        else:
+            missing.append(keyword)
+    
+    return matching, missing
+
 def extract_keywords_from_both(resume_text, jd_text):
     """Extract and match keywords with extensive debugging"""
     
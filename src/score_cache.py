@@ -0,0 +1,213 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+
+from similarity import scoring_config_version
+
+DEFAULT_CACHE_PATH = "score_cache.sqlite3"
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+TOUCH_BATCH_SIZE = 64      # recency updates buffered before one write
+TOUCH_FLUSH_SECONDS = 30   # ... or flushed once the oldest is this old
+
+
+def content_hash(text):
+    """SHA-256 of the exact text that was scored"""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+class ScoreCache:
+    """
+    Persistent cache of scoring results
+
+    Stores the dict returned by calculate_combined_score plus the matching and
+    missing keyword lists, keyed by (resume hash, JD hash, scoring config
+    version). Hashes are taken over the ORIGINAL texts, since keyword
+    extraction and cleaning both start from them. Changing weights,
+    thresholds or tokenization changes the version, so stale entries are
+    never returned.
+
+    The database runs in WAL mode so several processes can read while one
+    writes. Hits only read; their last_access updates are buffered and
+    written in batches, so readers do not queue for the write lock. When
+    the stored payloads exceed max_bytes, the least recently used entries
+    are evicted. SQLite errors in get and put are reported and treated as a
+    miss or a skipped write, so a broken cache never stops scoring. One
+    instance is safe to share between threads.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.config_version = scoring_config_version()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._touches = {}
+        self._first_touch = None
+
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS scores (
+                resume_hash TEXT NOT NULL,
+                jd_hash TEXT NOT NULL,
+                config_version TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                last_access REAL NOT NULL,
+                PRIMARY KEY (resume_hash, jd_hash, config_version)
+            ) WITHOUT ROWID
+        """)
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_scores_last_access ON scores (last_access)"
+        )
+        # Running estimate; other processes may also write, so eviction
+        # re-reads the real total before deleting anything
+        self._approx_bytes = self._total_bytes()
+
+    def _key(self, resume_text, jd_text):
+        return content_hash(resume_text), content_hash(jd_text), self.config_version
+
+    def _total_bytes(self):
+        return self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM scores").fetchone()[0]
+
+    def get(self, resume_text, jd_text):
+        """Return {'scores', 'matching', 'missing'} or None on a miss"""
+        key = self._key(resume_text, jd_text)
+        with self._lock:
+            try:
+                row = self._conn.execute(
+                    "SELECT payload FROM scores WHERE resume_hash = ? AND jd_hash = ? AND config_version = ?",
+                    key
+                ).fetchone()
+            except sqlite3.Error as e:
+                print(f"⚠️ WARNING: Score cache lookup failed, scoring instead ({e})")
+                row = None
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self._touch(key)
+        return json.loads(row[0])
+
+    def _touch(self, key):
+        """Buffer a recency update; write the buffer once it is big or old enough"""
+        now = time.time()
+        self._touches[key] = now
+        if self._first_touch is None:
+            self._first_touch = now
+
+        if len(self._touches) >= TOUCH_BATCH_SIZE or now - self._first_touch >= TOUCH_FLUSH_SECONDS:
+            try:
+                self._flush_touches()
+            except sqlite3.Error as e:
+                # Recency is only an eviction hint; drop it rather than fail a hit
+                print(f"⚠️ WARNING: Score cache could not record access times ({e})")
+                self._touches = {}
+                self._first_touch = None
+
+    def _flush_touches(self):
+        if not self._touches:
+            return
+        updates = [(accessed,) + key for key, accessed in self._touches.items()]
+        self._touches = {}
+        self._first_touch = None
+
+        self._execute_batch(
+            "UPDATE scores SET last_access = MAX(last_access, ?) "
+            "WHERE resume_hash = ? AND jd_hash = ? AND config_version = ?",
+            updates
+        )
+
+    def _execute_batch(self, sql, rows):
+        """Run sql for every row in one transaction, rolled back on failure"""
+        self._conn.execute("BEGIN")
+        try:
+            self._conn.executemany(sql, rows)
+            self._conn.execute("COMMIT")
+        except sqlite3.Error:
+            if self._conn.in_transaction:
+                self._conn.execute("ROLLBACK")
+            raise
+
+    def put(self, resume_text, jd_text, scores, matching, missing):
+        """Store one scoring result, evicting old entries if over budget"""
+        payload = json.dumps({'scores': scores, 'matching': matching, 'missing': missing})
+        size = len(payload.encode('utf-8'))
+        key = self._key(resume_text, jd_text)
+
+        with self._lock:
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO scores VALUES (?, ?, ?, ?, ?, ?)",
+                    key + (payload, size, time.time())
+                )
+                self._approx_bytes += size
+                if self._approx_bytes > self.max_bytes:
+                    self._evict()
+            except sqlite3.Error as e:
+                print(f"⚠️ WARNING: Score cache write skipped ({e})")
+
+    def _evict(self):
+        """Drop least recently used entries until 90% of max_bytes is free"""
+        self._flush_touches()
+        total = self._total_bytes()
+        target = int(self.max_bytes * 0.9)
+
+        if total > self.max_bytes:
+            to_free = total - target
+            victims = []
+            rows = self._conn.execute(
+                "SELECT resume_hash, jd_hash, config_version, size FROM scores ORDER BY last_access"
+            )
+            for resume_hash, jd_hash, version, size in rows:
+                if to_free <= 0:
+                    break
+                victims.append((resume_hash, jd_hash, version))
+                to_free -= size
+                total -= size
+            rows.close()
+
+            self._execute_batch(
+                "DELETE FROM scores WHERE resume_hash = ? AND jd_hash = ? AND config_version = ?",
+                victims
+            )
+            print(f"Score cache: evicted {len(victims)} entries")
+
+        self._approx_bytes = total
+
+    def stats(self):
+        """Hit/miss counters for this instance and current cache size"""
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM scores"
+            ).fetchone()
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'entries': entries,
+            'bytes': size,
+            'config_version': self.config_version
+        }
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM scores")
+            self._touches = {}
+            self._first_touch = None
+            self._approx_bytes = 0
+
+    def close(self):
+        with self._lock:
+            try:
+                self._flush_touches()
+            except sqlite3.Error as e:
+                print(f"⚠️ WARNING: Score cache could not record access times ({e})")
+            self._conn.close()
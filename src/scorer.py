@@ -27,6 +27,20 @@ def get_score_category(score):
     else:
         return "Poor Match", "🔴"
 
+def build_result(scores, matching_keywords, missing_keywords):
+    """Per-resume result: scores, keyword lists, final percentage and category"""
+    final_score = score_resume(scores['combined_score'])
+    category, emoji = get_score_category(final_score)
+    
+    return {
+        'scores': scores,
+        'matching': matching_keywords,
+        'missing': missing_keywords,
+        'final_score': final_score,
+        'category': category,
+        'emoji': emoji
+    }
+
 def generate_feedback(scores, matching_keywords, missing_keywords):
     """Generate detailed, actionable feedback based on analysis results"""
     feedback = []
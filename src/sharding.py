@@ -0,0 +1,285 @@
+import argparse
+import json
+import multiprocessing
+import queue
+import threading
+import urllib.error
+import urllib.request
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+from streaming import HISTOGRAM_BINS, iter_chunks, iter_resume_source, stream_rank
+
+DEFAULT_SHARD_SIZE = 5000
+DEFAULT_TIMEOUT = 600      # seconds a worker may take for one shard
+DEFAULT_MAX_ATTEMPTS = 3   # workers tried per shard before giving up
+
+
+class _WorkerHandler(BaseHTTPRequestHandler):
+    """
+    POST /rank  {'jd_text', 'k', 'start_index', 'resumes': [[id, text], ...]}
+                -> stream_rank result for the shard
+    GET /health -> {'status': 'ok'}
+    """
+
+    def _send_json(self, status, body):
+        payload = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._send_json(200, {'status': 'ok'})
+        else:
+            self._send_json(404, {'error': f"Unknown path {self.path}"})
+
+    def do_POST(self):
+        if self.path != "/rank":
+            self._send_json(404, {'error': f"Unknown path {self.path}"})
+            return
+
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            request = json.loads(self.rfile.read(length))
+            result = stream_rank(
+                [tuple(item) for item in request['resumes']],
+                request['jd_text'],
+                k=request['k'],
+                start_index=request['start_index']
+            )
+        except (KeyError, TypeError, ValueError) as e:
+            # Bad input: retrying on another worker would fail the same way
+            self._send_json(400, {'error': f"{type(e).__name__}: {e}"})
+            return
+        except Exception as e:
+            self._send_json(500, {'error': f"{type(e).__name__}: {e}"})
+            return
+
+        self._send_json(200, result)
+
+
+def serve_worker(host="127.0.0.1", port=8765, ready=None):
+    """Run a ranking worker until interrupted; sends the bound port to `ready` if given"""
+    server = ThreadingHTTPServer((host, port), _WorkerHandler)
+    if ready is not None:
+        ready.send(server.server_address[1])
+        ready.close()
+    print(f"Ranking worker listening on http://{host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+
+
+def start_local_workers(num_workers, host="127.0.0.1"):
+    """
+    Start num_workers ranking workers on free localhost ports
+
+    Returns (processes, urls). Meant for tests and single-machine runs;
+    stop them with stop_local_workers.
+    """
+    ctx = multiprocessing.get_context()
+    processes = []
+    urls = []
+
+    for _ in range(num_workers):
+        parent_conn, child_conn = ctx.Pipe(duplex=False)
+        process = ctx.Process(target=serve_worker, args=(host, 0, child_conn), daemon=True)
+        process.start()
+        child_conn.close()
+        port = parent_conn.recv()
+        parent_conn.close()
+        processes.append(process)
+        urls.append(f"http://{host}:{port}")
+
+    return processes, urls
+
+
+def stop_local_workers(processes):
+    for process in processes:
+        process.terminate()
+    for process in processes:
+        process.join(timeout=5)
+
+
+class ShardFailed(RuntimeError):
+    """Raised when a shard cannot be ranked by any worker"""
+
+
+class ShardCoordinator:
+    """
+    Rank a resume corpus across several workers and merge their top-k
+
+    The corpus is cut into contiguous shards of shard_size resumes. Each
+    shard goes to a free worker, which returns its partial top-k ranked by
+    combined_score with ties broken by global corpus position; merging the
+    partial lists with the same key gives exactly the single-machine
+    stream_rank result.
+
+    A worker that times out, refuses connections or returns a server error
+    is marked dead for the rest of the run and its shard is reassigned to
+    another live worker (up to max_attempts workers per shard).
+    """
+
+    def __init__(self, worker_urls, timeout=DEFAULT_TIMEOUT, max_attempts=DEFAULT_MAX_ATTEMPTS):
+        if not worker_urls:
+            raise ValueError("ShardCoordinator needs at least one worker URL")
+        self.worker_urls = [url.rstrip("/") for url in worker_urls]
+        self.timeout = timeout
+        self.max_attempts = max_attempts
+        self.dead_workers = set()
+        self._lock = threading.Lock()
+        self._idle = queue.Queue()
+
+    def _post(self, url, body):
+        request = urllib.request.Request(
+            f"{url}/rank",
+            data=json.dumps(body).encode('utf-8'),
+            headers={"Content-Type": "application/json"},
+            method="POST"
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            return json.loads(response.read())
+
+    def _live_count(self):
+        with self._lock:
+            return len(self.worker_urls) - len(self.dead_workers)
+
+    def _acquire_worker(self):
+        while True:
+            if self._live_count() == 0:
+                raise ShardFailed("All ranking workers have failed")
+            try:
+                return self._idle.get(timeout=1)
+            except queue.Empty:
+                continue
+
+    def _run_shard(self, shard_id, body):
+        errors = []
+
+        for _ in range(self.max_attempts):
+            url = self._acquire_worker()
+            try:
+                result = self._post(url, body)
+            except urllib.error.HTTPError as e:
+                message = e.read().decode('utf-8', errors='replace')
+                if e.code < 500:
+                    self._idle.put(url)
+                    raise ShardFailed(f"Shard {shard_id} rejected by {url}: {message}")
+                errors.append(f"{url}: HTTP {e.code} {message}")
+            except (urllib.error.URLError, OSError) as e:
+                errors.append(f"{url}: {e}")
+            else:
+                self._idle.put(url)
+                return result
+
+            with self._lock:
+                self.dead_workers.add(url)
+            print(f"⚠️ WARNING: Worker {url} failed on shard {shard_id}, reassigning ({errors[-1]})")
+
+        raise ShardFailed(f"Shard {shard_id} failed on {len(errors)} workers: {'; '.join(errors)}")
+
+    def rank(self, resumes, jd_text, k=50, shard_size=DEFAULT_SHARD_SIZE):
+        """
+        Rank resumes (anything iter_resume_source accepts) against jd_text
+
+        Returns the same dict as stream_rank, plus 'shards' and
+        'dead_workers'. At most two shards per live worker are held in
+        memory at once.
+        """
+        self.dead_workers = set()
+        self._idle = queue.Queue()
+        for url in self.worker_urls:
+            self._idle.put(url)
+
+        partials = []
+        shard_count = 0
+        start_index = 0
+        max_in_flight = 2 * len(self.worker_urls)
+
+        with ThreadPoolExecutor(max_workers=len(self.worker_urls)) as executor:
+            in_flight = set()
+
+            for shard_id, shard in enumerate(iter_chunks(iter_resume_source(resumes), shard_size)):
+                body = {'jd_text': jd_text, 'k': k, 'start_index': start_index, 'resumes': shard}
+                in_flight.add(executor.submit(self._run_shard, shard_id, body))
+                start_index += len(shard)
+                shard_count += 1
+
+                if len(in_flight) >= max_in_flight:
+                    done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    partials.extend(future.result() for future in done)
+
+            done, _ = wait(in_flight)
+            partials.extend(future.result() for future in done)
+
+        return self._merge(partials, k, shard_count)
+
+    def _merge(self, partials, k, shard_count):
+        candidates = [entry for partial in partials for entry in partial['top']]
+        candidates.sort(key=lambda e: (-e['result']['scores']['combined_score'], e['index']))
+
+        # Same bins as stream_rank, so an empty corpus still gets zero counts
+        histogram_counts = [0] * HISTOGRAM_BINS
+        categories = Counter()
+        for partial in partials:
+            histogram_counts = [a + b for a, b in zip(histogram_counts, partial['histogram']['counts'])]
+            categories.update(partial['categories'])
+
+        return {
+            'top': candidates[:k],
+            'total': sum(p['total'] for p in partials),
+            'scored': sum(p['scored'] for p in partials),
+            'skipped': sum(p['skipped'] for p in partials),
+            'histogram': {
+                'bin_edges': np.linspace(0, 100, HISTOGRAM_BINS + 1).tolist(),
+                'counts': histogram_counts
+            },
+            'categories': dict(categories),
+            'shards': shard_count,
+            'dead_workers': sorted(self.dead_workers)
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sharded resume ranking")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    worker = commands.add_parser("worker", help="Run a ranking worker")
+    worker.add_argument("--host", default="127.0.0.1")
+    worker.add_argument("--port", type=int, default=8765)
+
+    rank = commands.add_parser("rank", help="Rank a corpus across workers")
+    rank.add_argument("resumes", help="JSON Lines file with {\"id\", \"text\"} per line")
+    rank.add_argument("jd", help="Text file with the job description")
+    rank.add_argument("--workers", required=True, help="Comma-separated worker URLs")
+    rank.add_argument("--k", type=int, default=50)
+    rank.add_argument("--shard-size", type=int, default=DEFAULT_SHARD_SIZE)
+
+    args = parser.parse_args()
+
+    if args.command == "worker":
+        serve_worker(args.host, args.port)
+        return
+
+    with open(args.jd, encoding='utf-8') as f:
+        jd_text = f.read()
+
+    coordinator = ShardCoordinator(args.workers.split(","))
+    result = coordinator.rank(args.resumes, jd_text, k=args.k, shard_size=args.shard_size)
+
+    print(f"\nRanked {result['scored']} resumes in {result['shards']} shards "
+          f"({result['skipped']} skipped, dead workers: {result['dead_workers'] or 'none'})")
+    for rank_number, entry in enumerate(result['top'], 1):
+        r = entry['result']
+        print(f"{rank_number:3d}. {entry['resume_id']}  {r['final_score']}%  {r['emoji']} {r['category']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+import heapq
+import math
+import re
+from collections import Counter
+
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from preprocessing import clean_text, extract_keywords_advanced, match_keywords
+from similarity import (
+    SCORING_CONFIG, calculate_combined_score, get_weights, keyword_match_components
+)
+from scorer import build_result
+from batch_scoring import ONE_SIDED_IDF, two_document_idf_applies
+
+# Slack added to the TF-IDF bound so float rounding can never prune a winner
+BOUND_EPSILON = 1e-9
+
+
+def prepare_jd(jd_text):
+    """
+    Everything about the JD that does not depend on the resume
+
+    Keywords are extracted exactly as in extract_keywords_from_both, but
+    once per JD instead of once per resume.
+    """
+    jd_clean = clean_text(jd_text)
+    if len(jd_clean.split()) < 20:
+        raise ValueError(f"Text cleaning removed too much content (JD words: {len(jd_clean.split())})")
+
+    analyzer = TfidfVectorizer(**SCORING_CONFIG['tfidf']).build_analyzer()
+    keywords = extract_keywords_advanced(jd_clean, max_keywords=100)
+
+    return {
+        'clean': jd_clean,
+        'keywords': keywords,
+        'analyzer': analyzer,
+        'terms': Counter(analyzer(jd_clean)),
+        'keyword_checks': [(kw, keyword_check(kw)) for kw in keywords]
+    }
+
+
+def tfidf_upper_bound(resume_terms, jd_terms):
+    """
+    Upper bound on calculate_similarity from term counts alone
+
+    With two documents, terms in both get idf 1 and terms in one get
+    idf c = 1 + ln(3/2). By Cauchy-Schwarz the cosine is at most
+    sqrt(fr * fj), where f is the share of a document's squared TF-IDF
+    mass on shared terms. Needs only the token-set intersection, no fit.
+    """
+    if not two_document_idf_applies(SCORING_CONFIG['tfidf']):
+        return 1.0
+
+    shared = resume_terms.keys() & jd_terms.keys()
+    if not shared:
+        return 0.0
+
+    c2 = ONE_SIDED_IDF ** 2
+
+    def shared_fraction(terms):
+        shared_mass = 0.0
+        other_mass = 0.0
+        for term, count in terms.items():
+            weight = (1 + math.log(count)) ** 2
+            if term in shared:
+                shared_mass += weight
+            else:
+                other_mass += weight
+        return shared_mass / (shared_mass + c2 * other_mass)
+
+    bound = math.sqrt(shared_fraction(resume_terms) * shared_fraction(jd_terms))
+    return min(bound + BOUND_EPSILON, 1.0)
+
+
+def _variants(word):
+    """Whole-token forms of word that smart_keyword_match accepts"""
+    forms = {word, word + 's', word + 'ed'}
+    if word.endswith('s'):
+        forms.add(word[:-1])
+    return frozenset(forms)
+
+
+def keyword_check(keyword):
+    """
+    Precomputed necessary condition for smart_keyword_match(keyword, ...)
+
+    A single word needs one of its accepted forms as a whole token. A
+    phrase not found verbatim needs its first word plus enough of the
+    others for the 70% proximity rule somewhere in the resume (the 10-word
+    window is ignored). Built once per JD keyword; see keyword_may_match.
+    """
+    keyword = keyword.lower()
+
+    if ' ' not in keyword:
+        base = keyword[:-1] if keyword.endswith('s') else keyword
+        if not base or not re.fullmatch(r'\w+', keyword):
+            # Word boundaries next to non-word characters are subtle;
+            # a substring test is always safe
+            return ('substring', base)
+        return ('word', _variants(keyword) | {keyword + 'ing', keyword + 'er', keyword + 'ers'})
+
+    words = keyword.split()
+    return ('phrase', keyword, _variants(words[0]), [_variants(word) for word in words[1:]], len(words) * 0.7)
+
+
+def resume_tokens(resume_text):
+    """
+    Token sets used by keyword_may_match, built once per resume
+
+    'words' are runs of word characters (what the word-boundary regexes
+    see) and 'spaced' are whitespace-separated words (what proximity
+    matching compares).
+    """
+    text = resume_text.lower()
+    return {
+        'text': text,
+        'words': set(re.findall(r'\w+', text)),
+        'spaced': set(text.split())
+    }
+
+
+def keyword_may_match(check, tokens):
+    """False only if the keyword behind check certainly does not match the resume"""
+    kind = check[0]
+
+    if kind == 'word':
+        return not check[1].isdisjoint(tokens['words'])
+    if kind == 'substring':
+        return check[1] in tokens['text']
+
+    _, phrase, first_forms, other_forms, needed = check
+    if phrase in tokens['text']:
+        return True
+    if first_forms.isdisjoint(tokens['spaced']):
+        return False
+    present = 1 + sum(1 for forms in other_forms if not forms.isdisjoint(tokens['spaced']))
+    return present >= needed
+
+
+def keyword_score_from_matches(matching, jd_keywords):
+    """calculate_keyword_match for a list of matching keywords"""
+    basic_rate, weighted_rate = keyword_match_components(matching, jd_keywords)
+    return (basic_rate + weighted_rate) / 2 if matching else basic_rate
+
+
+def combined_upper_bound(tfidf_bound, keyword_bound, num_keywords):
+    """
+    Upper bound on combined_score given bounds on the TF-IDF and keyword scores
+
+    Boost rules only have >= thresholds, so any rule the real scores satisfy
+    is also satisfied at the bounds; the largest such boost caps the boost.
+    """
+    tfidf_weight, keyword_weight = get_weights(num_keywords)
+    boost_cap = max(
+        [boost for min_tfidf, min_keyword, boost, _ in SCORING_CONFIG['boost_rules']
+         if tfidf_bound >= min_tfidf and keyword_bound >= min_keyword],
+        default=0
+    )
+    return min((tfidf_bound * tfidf_weight) + (keyword_bound * keyword_weight) + boost_cap, 1.0)
+
+
+def shortlist_top_k(resumes, jd_text, k=50):
+    """
+    Top-k resumes for a JD without fully scoring every candidate
+
+    resumes yields (resume_id, resume_text) pairs of extracted text.
+
+    Stage 1 (every resume): token sets give a superset of the matching
+    keywords, hence a keyword score bound; with a TF-IDF bound from term
+    counts this bounds combined_score.
+    Stage 2 (in decreasing stage-1 bound order): exact keyword matching
+    tightens the bound, and only resumes that can still reach the current
+    k-th score get calculate_combined_score. A heap keeps the best k, and
+    the scan stops once no remaining stage-1 bound can reach the k-th score.
+
+    Ranking is by combined_score, ties broken by input position, so the
+    result equals sorting analyze_resume results for every resume. Resumes
+    analyze_resume would reject (too little text) are skipped.
+
+    Returns (shortlist, stats); shortlist entries are
+    {'resume_id', 'index', 'result'} best first.
+    """
+    if k < 1:
+        raise ValueError(f"k must be at least 1, got {k}")
+
+    jd = prepare_jd(jd_text)
+    num_keywords = len(jd['keywords'])
+
+    candidates = []
+    skipped = 0
+
+    for index, (resume_id, resume_text) in enumerate(resumes):
+        if not resume_text or len(resume_text.strip()) < 50:
+            skipped += 1
+            continue
+
+        resume_clean = clean_text(resume_text)
+        if len(resume_clean.split()) < 20:
+            skipped += 1
+            continue
+
+        tokens = resume_tokens(resume_text)
+        possible = [kw for kw, check in jd['keyword_checks'] if keyword_may_match(check, tokens)]
+        keyword_bound = keyword_score_from_matches(possible, jd['keywords'])
+
+        tfidf_bound = tfidf_upper_bound(Counter(jd['analyzer'](resume_clean)), jd['terms'])
+        bound = combined_upper_bound(tfidf_bound, keyword_bound, num_keywords)
+
+        candidates.append((bound, index, resume_id, resume_text, resume_clean, tfidf_bound, possible))
+
+    # Highest bound first; among equal bounds, earlier resumes first
+    candidates.sort(key=lambda c: (-c[0], c[1]))
+
+    heap = []  # (score, -index, ...) - heap[0] is the current k-th best
+    matched = 0
+    scored = 0
+
+    for bound, index, resume_id, resume_text, resume_clean, tfidf_bound, possible in candidates:
+        if len(heap) == k and bound < heap[0][0]:
+            break
+
+        # Keywords ruled out in stage 1 cannot match, so only the rest are tested
+        matching, _ = match_keywords(resume_text, possible)
+        matched_set = set(matching)
+        missing = [kw for kw in jd['keywords'] if kw not in matched_set]
+        matched += 1
+
+        keyword_score = keyword_score_from_matches(matching, jd['keywords'])
+        if len(heap) == k and combined_upper_bound(tfidf_bound, keyword_score, num_keywords) < heap[0][0]:
+            continue
+
+        keyword_data = {'jd_keywords': jd['keywords'], 'matching': matching, 'missing': missing}
+        scores = calculate_combined_score(resume_clean, jd['clean'], keyword_data)
+        scored += 1
+
+        entry = (scores['combined_score'], -index, resume_id, scores, matching, missing)
+        if len(heap) < k:
+            heapq.heappush(heap, entry)
+        elif entry[:2] > heap[0][:2]:
+            heapq.heapreplace(heap, entry)
+
+    shortlist = [
+        {'resume_id': resume_id, 'index': -neg_index, 'result': build_result(scores, matching, missing)}
+        for _, neg_index, resume_id, scores, matching, missing in sorted(heap, key=lambda e: e[:2], reverse=True)
+    ]
+
+    stats = {
+        'candidates': len(candidates),
+        'skipped': skipped,
+        'keyword_matched': matched,
+        'scored': scored,
+        'pruned': len(candidates) - scored
+    }
+    print(
+        f"Shortlist: keyword-matched {matched}/{len(candidates)} candidates, "
+        f"scored {scored} with TF-IDF, pruned {stats['pruned']}"
+    )
+
+    return shortlist, stats
@@ -1,6 +1,65 @@
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 import numpy as np
+import hashlib
+import json
+
+# Bump whenever scoring logic changes in a way SCORING_CONFIG does not capture
+# (keyword extraction, keyword matching, text cleaning). Cached scores are
+# keyed on scoring_config_version(), so a bump invalidates them.
+SCORING_VERSION = 1
+
+SCORING_CONFIG = {
+    # Optimized TF-IDF settings - NO max_features limit!
+    'tfidf': {
+        'ngram_range': (1, 2),      # 1-2 word phrases
+        'min_df': 1,                 # Keep all terms (we have only 2 docs)
+        'max_df': 1.0,               # Don't filter any terms (only 2 docs)
+        'lowercase': True,           # Already lowercase, but ensure it
+        'token_pattern': r'\b[\w\+\#\.\-]{2,}\b',  # Min 2 chars, keep tech symbols
+        'sublinear_tf': True,        # Log scaling
+        'norm': 'l2',                # L2 normalization
+    },
+    # Adaptive weighting: (min JD keywords, TF-IDF weight, keyword weight),
+    # first matching tier wins
+    'weight_tiers': [
+        (50, 0.55, 0.45),
+        (30, 0.60, 0.40),
+        (0, 0.65, 0.35),
+    ],
+    # Smart boosting: (min TF-IDF, min keyword score, boost, reason),
+    # first matching rule wins
+    'boost_rules': [
+        (0.35, 0.45, 0.05, 'strong synergy'),
+        (0.25, 0.60, 0.03, 'strong keywords'),
+        (0.40, 0.0, 0.02, 'strong semantic'),
+    ],
+}
+
+
+def scoring_config_version(config=None):
+    """Version tag that changes whenever the scoring config or SCORING_VERSION changes"""
+    config = config or SCORING_CONFIG
+    digest = hashlib.sha256(json.dumps(config, sort_keys=True).encode('utf-8')).hexdigest()
+    return f"v{SCORING_VERSION}-{digest[:12]}"
+
+
+def get_weights(num_keywords, config=None):
+    """Return (tfidf_weight, keyword_weight) for a JD with num_keywords keywords"""
+    config = config or SCORING_CONFIG
+    for min_keywords, tfidf_weight, keyword_weight in config['weight_tiers']:
+        if num_keywords >= min_keywords:
+            return tfidf_weight, keyword_weight
+    raise ValueError(f"No weight tier covers {num_keywords} keywords")
+
+
+def get_boost(tfidf_score, keyword_score, config=None):
+    """Return (boost, reason) from the first boost rule the scores satisfy"""
+    config = config or SCORING_CONFIG
+    for min_tfidf, min_keyword, boost, reason in config['boost_rules']:
+        if tfidf_score >= min_tfidf and keyword_score >= min_keyword:
+            return boost, reason
+    return 0, None
 
 def calculate_similarity(resume_text, jd_text):
     """
@@ -24,17 +83,7 @@ def calculate_similarity(resume_text, jd_text):
         print(f"⚠️ WARNING: Very short text (Resume: {resume_words}, JD: {jd_words})")
         print("This will likely result in low similarity scores")
     
-    # Optimized TF-IDF settings - NO max_features limit!
-    vectorizer = TfidfVectorizer(
-        ngram_range=(1, 2),      # 1-2 word phrases
-        min_df=1,                 # Keep all terms (we have only 2 docs)
-        max_df=1.0,               # Don't filter any terms (only 2 docs)
-        lowercase=True,           # Already lowercase, but ensure it
-        token_pattern=r'\b[\w\+\#\.\-]{2,}\b',  # Min 2 chars, keep tech symbols
-        sublinear_tf=True,        # Log scaling
-        norm='l2',                # L2 normalization
-        # NO max_features - let it use all terms!
-    )
+    vectorizer = TfidfVectorizer(**SCORING_CONFIG['tfidf'])
     
     try:
         # Fit and transform
@@ -87,28 +136,40 @@ def calculate_similarity(resume_text, jd_text):
         traceback.print_exc()
         return 0.0
 
-def calculate_keyword_match(matching_keywords, jd_keywords):
-    """Calculate keyword match with weighted scoring"""
+def keyword_match_components(matching_keywords, jd_keywords):
+    """Return (basic match rate, phrase-length-weighted match rate)"""
     
     if not jd_keywords:
-        return 0.0
+        return 0.0, 0.0
     
     # Basic match rate
     match_rate = len(matching_keywords) / len(jd_keywords)
     
     # Weight multi-word phrases more heavily (they're more specific)
-    if matching_keywords:
-        weighted_score = 0
-        total_weight = 0
-        
-        for kw in jd_keywords:
-            weight = len(kw.split())  # Single words = 1, phrases = 2+
-            total_weight += weight
-            
-            if kw in matching_keywords:
-                weighted_score += weight
+    weighted_score = 0
+    total_weight = 0
+    matched = set(matching_keywords)
+    
+    for kw in jd_keywords:
+        weight = len(kw.split())  # Single words = 1, phrases = 2+
+        total_weight += weight
         
-        weighted_rate = weighted_score / total_weight if total_weight > 0 else 0
+        if kw in matched:
+            weighted_score += weight
+    
+    weighted_rate = weighted_score / total_weight if total_weight > 0 else 0
+    
+    return match_rate, weighted_rate
+
+def calculate_keyword_match(matching_keywords, jd_keywords):
+    """Calculate keyword match with weighted scoring"""
+    
+    if not jd_keywords:
+        return 0.0
+    
+    match_rate, weighted_rate = keyword_match_components(matching_keywords, jd_keywords)
+    
+    if matching_keywords:
         final_rate = (match_rate + weighted_rate) / 2
         
         print(f"\nKeyword match: {len(matching_keywords)}/{len(jd_keywords)}")
@@ -151,15 +212,7 @@ def calculate_combined_score(resume_text, jd_text, keyword_data):
     # Adaptive weighting
     num_keywords = len(keyword_data['jd_keywords'])
     
-    if num_keywords >= 50:
-        tfidf_weight = 0.55
-        keyword_weight = 0.45
-    elif num_keywords >= 30:
-        tfidf_weight = 0.60
-        keyword_weight = 0.40
-    else:
-        tfidf_weight = 0.65
-        keyword_weight = 0.35
+    tfidf_weight, keyword_weight = get_weights(num_keywords)
     
     print(f"\nWeights: TF-IDF={tfidf_weight}, Keywords={keyword_weight} (based on {num_keywords} JD keywords)")
     
@@ -167,16 +220,9 @@ def calculate_combined_score(resume_text, jd_text, keyword_data):
     base_score = (tfidf_score * tfidf_weight) + (keyword_score * keyword_weight)
     
     # Smart boosting
-    boost = 0
-    if tfidf_score >= 0.35 and keyword_score >= 0.45:
-        boost = 0.05
-        print(f"Boost: +{boost:.2f} (strong synergy)")
-    elif keyword_score >= 0.60 and tfidf_score >= 0.25:
-        boost = 0.03
-        print(f"Boost: +{boost:.2f} (strong keywords)")
-    elif tfidf_score >= 0.40:
-        boost = 0.02
-        print(f"Boost: +{boost:.2f} (strong semantic)")
+    boost, boost_reason = get_boost(tfidf_score, keyword_score)
+    if boost_reason:
+        print(f"Boost: +{boost:.2f} ({boost_reason})")
     
     combined_score = min(base_score + boost, 1.0)
     
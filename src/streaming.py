@@ -0,0 +1,158 @@
+import heapq
+import itertools
+import json
+from collections import Counter
+
+import numpy as np
+
+from batch_scoring import batch_score, batch_tfidf_similarity
+from preprocessing import clean_text, match_keywords
+from scorer import build_result, get_score_category, score_resume
+from shortlist import prepare_jd
+
+DEFAULT_CHUNK_SIZE = 1000
+HISTOGRAM_BINS = 20  # 5-point bins over 0-100%
+
+
+def iter_resume_source(source):
+    """
+    Yield (resume_id, resume_text) pairs from a resume source
+
+    source is a path to a JSON Lines file with one {"id", "text"} object
+    per line, or an iterable of (resume_id, resume_text) pairs or plain
+    texts (ids then default to their position).
+    """
+    if isinstance(source, str):
+        with open(source, encoding='utf-8') as f:
+            for line_number, line in enumerate(f):
+                if line.strip():
+                    record = json.loads(line)
+                    yield record.get('id', line_number), record['text']
+        return
+
+    for position, item in enumerate(source):
+        if isinstance(item, str):
+            yield position, item
+        else:
+            yield item
+
+
+def iter_chunks(iterable, chunk_size):
+    """Yield lists of up to chunk_size items without materialising the rest"""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _row_scores(scored, row):
+    """One row of batch_score output as a calculate_combined_score-style dict"""
+    return {
+        'tfidf_score': float(scored['tfidf_score'][row]),
+        'keyword_score': float(scored['keyword_score'][row]),
+        'combined_score': float(scored['combined_score'][row]),
+        'matching_count': int(scored['matching_count'][row]),
+        'total_jd_keywords': scored['total_jd_keywords'],
+        'boost_applied': float(scored['boost_applied'][row])
+    }
+
+
+def stream_rank(source, jd_text, k=50, chunk_size=DEFAULT_CHUNK_SIZE, start_index=0):
+    """
+    Rank an arbitrarily large resume corpus against one JD in bounded memory
+
+    Resumes are read from source (see iter_resume_source) chunk_size at a
+    time. Each chunk is scored as one sparse block (batch_tfidf_similarity
+    and batch_score), then dropped; only the top-k heap and summary
+    statistics survive, so peak memory is O(chunk_size + k).
+
+    Ranking is by combined_score, ties broken by stream position (counted
+    from start_index). Resumes with too little text are counted as skipped.
+
+    Returns {'top', 'total', 'scored', 'skipped', 'histogram', 'categories'}
+    where top holds {'resume_id', 'index', 'result'} entries best first,
+    histogram has 'bin_edges' and 'counts' over final percentage scores,
+    and categories counts get_score_category bands.
+    """
+    if k < 1:
+        raise ValueError(f"k must be at least 1, got {k}")
+
+    jd = prepare_jd(jd_text)
+
+    heap = []  # (combined_score, -index, resume_id, result) - heap[0] is the k-th best
+    histogram = np.zeros(HISTOGRAM_BINS, dtype=np.int64)
+    bin_edges = np.linspace(0, 100, HISTOGRAM_BINS + 1)
+    categories = Counter()
+    total = 0
+    skipped = 0
+
+    for chunk in iter_chunks(iter_resume_source(source), chunk_size):
+        indices = []
+        resume_ids = []
+        resume_cleans = []
+        matching_lists = []
+        missing_lists = []
+
+        for offset, (resume_id, resume_text) in enumerate(chunk):
+            index = start_index + total + offset
+            if not resume_text or len(resume_text.strip()) < 50:
+                skipped += 1
+                continue
+
+            resume_clean = clean_text(resume_text)
+            if len(resume_clean.split()) < 20:
+                skipped += 1
+                continue
+
+            matching, missing = match_keywords(resume_text, jd['keywords'])
+            indices.append(index)
+            resume_ids.append(resume_id)
+            resume_cleans.append(resume_clean)
+            matching_lists.append(matching)
+            missing_lists.append(missing)
+
+        total += len(chunk)
+        if not indices:
+            continue
+
+        tfidf_scores = batch_tfidf_similarity(resume_cleans, jd['clean'])
+        scored = batch_score(tfidf_scores, matching_lists, jd['keywords'])
+        combined = scored['combined_score']
+
+        final_scores = [score_resume(score) for score in combined]
+        histogram += np.histogram(final_scores, bins=bin_edges)[0]
+        categories.update(get_score_category(score)[0] for score in final_scores)
+
+        # Later positions lose ties, so only rows strictly above the current
+        # k-th score can enter a full heap
+        threshold = heap[0][0] if len(heap) == k else -np.inf
+        for row in np.flatnonzero(combined > threshold):
+            entry_key = (float(combined[row]), -indices[row])
+            if len(heap) == k and entry_key <= heap[0][:2]:
+                continue
+
+            result = build_result(_row_scores(scored, row), matching_lists[row], missing_lists[row])
+            entry = entry_key + (resume_ids[row], result)
+            if len(heap) < k:
+                heapq.heappush(heap, entry)
+            else:
+                heapq.heapreplace(heap, entry)
+
+        print(f"Stream rank: {total} resumes read, {total - skipped} scored, "
+              f"k-th best so far {heap[0][0] * 100:.1f}%")
+
+    top = [
+        {'resume_id': resume_id, 'index': -neg_index, 'result': result}
+        for _, neg_index, resume_id, result in sorted(heap, key=lambda e: e[:2], reverse=True)
+    ]
+
+    return {
+        'top': top,
+        'total': total,
+        'scored': total - skipped,
+        'skipped': skipped,
+        'histogram': {'bin_edges': bin_edges.tolist(), 'counts': histogram.tolist()},
+        'categories': dict(categories)
+    }
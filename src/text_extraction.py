@@ -1,10 +1,133 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
 import pdfplumber
 
-def extract_text_from_pdf(file_path):
-    text = ""
+try:
+    import resource
+except ImportError:  # Windows: no address-space limits to share
+    resource = None
+
+PAGE_SEPARATOR = "\n"
+PARALLEL_PAGE_THRESHOLD = 40             # split documents with at least this many pages
+PARALLEL_MAX_WORKERS = os.cpu_count() or 1
+MIN_RANGE_MEMORY_MB = 64                 # smallest memory share worth a page-range process
+
+
+class PageLimitExceeded(ValueError):
+    """Raised when a PDF has more pages than the caller allows"""
+
+
+def _extract_page_range(file_path, start, end):
+    """Text of pages [start, end), opening the file independently"""
+    with pdfplumber.open(file_path) as pdf:
+        return [pdf.pages[i].extract_text() for i in range(start, end)]
+
+
+def _address_space():
+    """Bytes of address space this process has mapped (Linux)"""
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[0]) * resource.getpagesize()
+
+
+def _limit_growth(extra_bytes):
+    """Cap this process's RLIMIT_AS at its current size plus extra_bytes"""
+    _, hard = resource.getrlimit(resource.RLIMIT_AS)
+    limit = _address_space() + extra_bytes
+    if hard != resource.RLIM_INFINITY:
+        limit = min(limit, hard)
+    resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+
+
+def _memory_plan(max_workers):
+    """
+    Fan-out and per-process memory share that stay within RLIMIT_AS
+
+    Page-range processes would each inherit the caller's full limit, so
+    the caller's remaining headroom is split between it and the workers
+    instead, and the fan-out is cut so no share falls below
+    MIN_RANGE_MEMORY_MB. Returns (num_workers, share_bytes); share is None
+    when there is no limit to share.
+    """
+    if resource is None:
+        return max_workers, None
+
+    soft, _ = resource.getrlimit(resource.RLIMIT_AS)
+    if soft == resource.RLIM_INFINITY:
+        return max_workers, None
+
+    try:
+        headroom = soft - _address_space()
+    except OSError:
+        # A limit we cannot account for: stay serial
+        return 1, None
+
+    num_workers = min(max_workers, headroom // (MIN_RANGE_MEMORY_MB * 1024 * 1024) - 1)
+    if num_workers <= 1:
+        return 1, None
+    return num_workers, headroom // (num_workers + 1)
+
+
+def _page_ranges(page_count, num_ranges):
+    """Split page_count pages into num_ranges contiguous, near-equal ranges"""
+    size, extra = divmod(page_count, num_ranges)
+    ranges = []
+    start = 0
+    for i in range(num_ranges):
+        end = start + size + (1 if i < extra else 0)
+        ranges.append((start, end))
+        start = end
+    return ranges
+
+
+def extract_text_from_pdf(file_path, max_pages=None, parallel_threshold=None, max_workers=None):
+    """
+    Extract text from every page, pages joined by PAGE_SEPARATOR
+
+    Documents with at least parallel_threshold pages (PARALLEL_PAGE_THRESHOLD
+    by default) are split into page ranges extracted by up to max_workers
+    processes (PARALLEL_MAX_WORKERS by default), each opening the file
+    itself; the output is the same as the serial path. Under an RLIMIT_AS
+    the whole document stays within the caller's limit (see _memory_plan).
+    """
+    if parallel_threshold is None:
+        parallel_threshold = PARALLEL_PAGE_THRESHOLD
+    if max_workers is None:
+        max_workers = PARALLEL_MAX_WORKERS
+
     with pdfplumber.open(file_path) as pdf:
-        for page in pdf.pages:
-            page_text = page.extract_text()
-            if page_text:
-                text += page_text
-    return text
+        page_count = len(pdf.pages)
+        if max_pages is not None and page_count > max_pages:
+            raise PageLimitExceeded(
+                f"PDF has {page_count} pages (limit is {max_pages})"
+            )
+
+        num_workers, share = 1, None
+        if page_count >= parallel_threshold and max_workers > 1:
+            num_workers, share = _memory_plan(min(max_workers, page_count))
+
+        if num_workers <= 1:
+            page_texts = [page.extract_text() for page in pdf.pages]
+        else:
+            page_texts = None
+
+    if page_texts is None:
+        # A couple of ranges per worker evens out pages of uneven cost
+        ranges = _page_ranges(page_count, min(page_count, num_workers * 2))
+
+        if share is not None:
+            previous = resource.getrlimit(resource.RLIMIT_AS)
+            _limit_growth(share)
+        try:
+            with ProcessPoolExecutor(
+                max_workers=num_workers,
+                initializer=_limit_growth if share is not None else None,
+                initargs=(share,) if share is not None else ()
+            ) as executor:
+                futures = [executor.submit(_extract_page_range, file_path, start, end) for start, end in ranges]
+                page_texts = [text for future in futures for text in future.result()]
+        finally:
+            if share is not None:
+                resource.setrlimit(resource.RLIMIT_AS, previous)
+
+    return PAGE_SEPARATOR.join(text for text in page_texts if text)
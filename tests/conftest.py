@@ -0,0 +1,70 @@
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+VOCAB = (
+    "python java sql aws docker kubernetes machine learning data analysis pipelines spark "
+    "communication leadership team agile scrum react node typescript testing cloud azure "
+    "statistics modeling deep tensorflow pytorch etl warehouse tableau excel reporting "
+    "stakeholders engineering backend frontend apis microservices security linux git design"
+).split()
+
+
+def write_pdf(path, pages):
+    """Write a minimal text PDF with one page per string in pages"""
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        None,
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    kids = []
+    for text in pages:
+        words = text.split()
+        lines = [" ".join(words[i:i + 10]) for i in range(0, len(words), 10)] or [""]
+        stream = "BT /F1 10 Tf 14 TL 40 750 Td " + " ".join(f"({line}) Tj T*" for line in lines) + " ET"
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents {len(objects)} 0 R "
+            f"/Resources << /Font << /F1 3 0 R >> >> >>"
+        )
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(pages)} >>"
+
+    out = b"%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n{body}\nendobj\n".encode()
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    out += b"".join(f"{offset:010d} 00000 n \n".encode() for offset in offsets)
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+
+    with open(path, "wb") as f:
+        f.write(out)
+    return str(path)
+
+
+def make_text(seed, num_words):
+    """Deterministic pseudo-resume drawn from a shared tech vocabulary"""
+    rng = random.Random(seed)
+    vocab = VOCAB[:rng.randint(12, len(VOCAB))]
+    return " ".join(rng.choice(vocab) for _ in range(num_words)) + "."
+
+
+@pytest.fixture(scope="session")
+def jd_text():
+    return make_text("jd", 250)
+
+
+@pytest.fixture(scope="session")
+def resumes():
+    """(resume_id, text) pairs, including exact duplicates so scores tie"""
+    corpus = [(f"resume-{i}", make_text(i, 60 + (i * 37) % 400)) for i in range(60)]
+    duplicates = [(f"copy-{i}", corpus[i][1]) for i in (3, 3, 17, 42)]
+    too_short = [("empty", ""), ("short", "python sql")]
+    return corpus + duplicates + too_short
@@ -0,0 +1,40 @@
+import numpy as np
+
+from batch_scoring import batch_score, batch_tfidf_similarity
+from preprocessing import clean_text, extract_keywords_from_both
+from similarity import calculate_combined_score, calculate_similarity
+
+
+def test_batch_score_matches_scalar_scoring(resumes, jd_text):
+    jd_clean = clean_text(jd_text)
+    texts = [text for _, text in resumes if len(text) >= 50]
+
+    keyword_data = [extract_keywords_from_both(text, jd_text) for text in texts]
+    cleans = [clean_text(text) for text in texts]
+    expected = [calculate_combined_score(clean, jd_clean, data) for clean, data in zip(cleans, keyword_data)]
+
+    jd_keywords = keyword_data[0]['jd_keywords']
+    batch = batch_score(
+        [scores['tfidf_score'] for scores in expected],
+        [data['matching'] for data in keyword_data],
+        jd_keywords
+    )
+
+    for key in ('tfidf_score', 'keyword_score', 'combined_score', 'matching_count', 'boost_applied'):
+        assert batch[key].tolist() == [scores[key] for scores in expected], key
+    assert batch['total_jd_keywords'] == len(jd_keywords)
+
+
+def test_batch_tfidf_matches_calculate_similarity(resumes, jd_text):
+    jd_clean = clean_text(jd_text)
+    cleans = [clean_text(text) for _, text in resumes if len(text) >= 50]
+
+    expected = np.array([calculate_similarity(clean, jd_clean) for clean in cleans])
+    np.testing.assert_allclose(batch_tfidf_similarity(cleans, jd_clean), expected, rtol=0, atol=1e-12)
+
+    # A resume's score must not depend on the rest of its chunk
+    halves = np.concatenate([
+        batch_tfidf_similarity(cleans[:7], jd_clean),
+        batch_tfidf_similarity(cleans[7:], jd_clean)
+    ])
+    assert halves.tolist() == batch_tfidf_similarity(cleans, jd_clean).tolist()
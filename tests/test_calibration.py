@@ -0,0 +1,102 @@
+import math
+
+import numpy as np
+import pytest
+from sklearn.metrics import roc_auc_score
+
+from batch_scoring import batch_combined_scores
+from calibration import CalibrationSet
+from feature_store import FEATURE_COLUMNS, FeatureStore
+
+
+def empty_features():
+    return {name: np.empty(0, dtype=dtype) for name, dtype in FEATURE_COLUMNS.items()}
+
+
+def test_empty_calibration_set_evaluates_to_nan():
+    metrics = CalibrationSet(empty_features()).evaluate()
+    assert all(math.isnan(value) for value in metrics.values())
+
+
+def test_feature_store_creates_directory_only_on_write(tmp_path):
+    path = tmp_path / "store"
+    store = FeatureStore(str(path))
+    assert not path.exists()
+    with pytest.raises(FileNotFoundError):
+        store.load()
+
+    store.add(7, 1.0, {'tfidf_score': 0.5, 'basic_rate': 0.25, 'weighted_rate': 0.3,
+                       'matching_count': 4, 'num_keywords': 16})
+    store.flush()
+    features = FeatureStore(str(path)).load()
+    assert path.is_dir()
+    assert features['group'].tolist() == [7]
+    assert features['matching_count'].tolist() == [4]
+
+
+def random_features(seed=0, num_groups=12):
+    rng = np.random.default_rng(seed)
+    sizes = rng.integers(1, 30, num_groups)
+    n = int(sizes.sum())
+    matching = rng.integers(0, 20, n)
+    return {
+        'group': rng.permutation(np.repeat(np.arange(num_groups) * 10, sizes)),
+        'label': rng.choice([0.0, 0.0, 1.0, 2.0], n),
+        'tfidf_score': rng.random(n),
+        'basic_rate': rng.random(n),
+        'weighted_rate': rng.random(n),
+        'matching_count': matching,
+        'num_keywords': rng.integers(10, 80, n),
+    }
+
+
+def reference_metrics(groups, labels, scores, k):
+    """Per-group P@k and NDCG@k with stable ordering, one group at a time"""
+    precisions, ndcgs = [], []
+    for group in np.unique(groups):
+        rows = np.flatnonzero(groups == group)
+        ranked = sorted(rows, key=lambda row: -scores[row])
+        ideal = sorted(labels[rows], reverse=True)
+
+        precisions.append(sum(labels[row] > 0 for row in ranked[:k]) / min(len(rows), k))
+        dcg = sum((2 ** labels[row] - 1) / math.log2(i + 2) for i, row in enumerate(ranked[:k]))
+        ideal_dcg = sum((2 ** label - 1) / math.log2(i + 2) for i, label in enumerate(ideal[:k]))
+        if ideal_dcg > 0:
+            ndcgs.append(dcg / ideal_dcg)
+    return np.mean(precisions), np.mean(ndcgs)
+
+
+def test_metrics_match_reference_implementations():
+    features = random_features()
+    calibration_set = CalibrationSet(features, k=5)
+    metrics = calibration_set.evaluate()
+
+    scores, _ = batch_combined_scores(
+        calibration_set.tfidf_scores, calibration_set.keyword_scores, calibration_set.num_keywords
+    )
+    precision, ndcg = reference_metrics(calibration_set.groups, calibration_set.labels, scores, k=5)
+
+    assert metrics['auc'] == pytest.approx(roc_auc_score(calibration_set.labels > 0, scores))
+    assert metrics['precision_at_k'] == pytest.approx(precision)
+    assert metrics['ndcg_at_k'] == pytest.approx(ndcg)
+    assert metrics['mean_score'] == pytest.approx(scores.mean())
+
+
+def test_metrics_on_hand_computed_example():
+    # One group, scores ranking the labels [2, 0, 1, 0]; all rows share a weight tier
+    calibration_set = CalibrationSet({
+        'group': np.zeros(4, dtype=np.int64),
+        'label': np.array([0.0, 1.0, 2.0, 0.0]),
+        'tfidf_score': np.array([0.3, 0.2, 0.4, 0.1]),
+        'basic_rate': np.zeros(4),
+        'weighted_rate': np.zeros(4),
+        'matching_count': np.zeros(4, dtype=np.int64),
+        'num_keywords': np.full(4, 30, dtype=np.int64),
+    }, k=2)
+    metrics = calibration_set.evaluate()
+
+    # Positives {0.4, 0.2} vs negatives {0.3, 0.1}: 3 of 4 pairs ordered correctly
+    assert metrics['auc'] == pytest.approx(0.75)
+    assert metrics['precision_at_k'] == pytest.approx(0.5)
+    # DCG@2 = 3/log2(2) + 0; ideal = 3/log2(2) + 1/log2(3)
+    assert metrics['ndcg_at_k'] == pytest.approx(3 / (3 + 1 / math.log2(3)))
@@ -0,0 +1,61 @@
+import os
+import signal
+import threading
+
+import pytest
+
+from conftest import make_text, write_pdf
+from extraction_sandbox import ExtractionPool
+
+
+@pytest.fixture
+def small_pdf(tmp_path):
+    return write_pdf(tmp_path / "small.pdf", [make_text(page, 40) for page in range(3)])
+
+
+@pytest.fixture
+def hanging_path(tmp_path):
+    """A FIFO with no writer: opening it blocks the worker indefinitely"""
+    path = str(tmp_path / "hang.pdf")
+    os.mkfifo(path)
+    return path
+
+
+def test_timeout_kills_worker_and_next_document_succeeds(small_pdf, hanging_path):
+    with ExtractionPool(num_workers=1, timeout=0.5) as pool:
+        old_worker, = pool._workers
+
+        result = pool.extract(hanging_path)
+        assert not result['ok']
+        assert result['error']['type'] == 'timeout'
+        assert not old_worker.process.is_alive()
+
+        # The replacement is ready before it is handed out, so its startup
+        # does not eat into the next document's time limit
+        replacement, = pool._workers
+        assert replacement is not old_worker and replacement.process.is_alive()
+        result = pool.extract(small_pdf)
+        assert result['ok'], result['error']
+        assert make_text(0, 40).split()[0] in result['text']
+
+
+def test_page_limit_error(tmp_path):
+    path = write_pdf(tmp_path / "long.pdf", [make_text(page, 20) for page in range(6)])
+    with ExtractionPool(num_workers=1, max_pages=5) as pool:
+        result = pool.extract(path)
+    assert not result['ok']
+    assert result['error']['type'] == 'page_limit'
+
+
+def test_crashed_worker_is_reported_and_replaced(small_pdf, hanging_path):
+    with ExtractionPool(num_workers=1, timeout=30) as pool:
+        worker, = pool._workers
+        timer = threading.Timer(0.5, os.kill, (worker.process.pid, signal.SIGKILL))
+        timer.start()
+        result = pool.extract(hanging_path)
+        timer.join()
+
+        assert not result['ok']
+        assert result['error']['type'] == 'crashed'
+        assert 'exit code -9' in result['error']['message']
+        assert pool.extract(small_pdf)['ok']
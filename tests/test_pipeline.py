@@ -0,0 +1,76 @@
+import asyncio
+import io
+
+import pytest
+
+from conftest import make_text, write_pdf
+from pipeline import make_score_executor, run_pipeline, stream_pipeline
+
+
+def test_score_pool_recovers_from_dead_process(tmp_path, jd_text):
+    paths = [write_pdf(tmp_path / f"r{i}.pdf", [make_text(i, 150)]) for i in range(3)]
+    resumes = [(f"r{i}", path) for i, path in enumerate(paths)]
+
+    executor = make_score_executor(2)
+    try:
+        first = run_pipeline(resumes, jd_text, score_executor=executor)
+        assert all(item['error'] is None for item in first)
+
+        for process in list(executor._executor._processes.values()):
+            process.kill()
+            process.join()
+
+        second = run_pipeline(resumes, jd_text, score_executor=executor)
+        assert [item['error'] for item in second] == [None, None, None]
+        assert [item['result'] for item in second] == [item['result'] for item in first]
+        assert executor.restarts == 1
+    finally:
+        executor.shutdown()
+
+
+def test_every_input_gets_one_result_with_errors_passed_through(tmp_path, jd_text):
+    good = write_pdf(tmp_path / "good.pdf", [make_text("good", 150)])
+    short = write_pdf(tmp_path / "short.pdf", ["too short"])
+    with open(good, "rb") as f:
+        data = f.read()
+    resumes = [
+        item
+        for _ in range(3)
+        for item in [
+            ("good", good),
+            ("not_pdf", b"this is not a pdf"),
+            ("missing", str(tmp_path / "missing.pdf")),
+            ("short", short),
+            ("upload", io.BytesIO(data)),
+        ]
+    ]
+
+    results = run_pipeline(resumes, jd_text, io_workers=2, extract_workers=2, score_workers=2, queue_size=2)
+
+    assert [item['index'] for item in results] == list(range(len(resumes)))
+    assert [item['name'] for item in results] == [name for name, _ in resumes]
+    for item in results:
+        if item['name'] in ("good", "upload"):
+            assert item['error'] is None and item['result']['final_score'] > 0
+        else:
+            assert item['error'] and item['result'] is None, item['name']
+    assert "Could not extract text" in results[3]['error']
+
+
+def test_source_error_still_yields_earlier_results(tmp_path, jd_text):
+    good = write_pdf(tmp_path / "good.pdf", [make_text("good", 150)])
+
+    def source():
+        for i in range(3):
+            yield f"r{i}", good
+        raise OSError("upload stream closed")
+
+    async def collect(items):
+        async for item in stream_pipeline(source(), jd_text, extract_workers=1, score_workers=1):
+            items.append(item)
+
+    items = []
+    with pytest.raises(OSError, match="upload stream closed"):
+        asyncio.run(collect(items))
+    assert sorted(item['index'] for item in items) == [0, 1, 2]
+    assert all(item['error'] is None for item in items)
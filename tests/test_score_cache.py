@@ -0,0 +1,65 @@
+import itertools
+import json
+
+import similarity
+import score_cache
+from calibration import make_config
+from score_cache import ScoreCache
+
+SCORES = {'tfidf_score': 0.4, 'keyword_score': 0.6, 'combined_score': 0.5}
+
+
+def put(cache, name):
+    cache.put(f"resume {name}", "jd", SCORES, ["python"], ["java"])
+
+
+def test_hits_and_misses_are_counted(tmp_path):
+    cache = ScoreCache(str(tmp_path / "cache.sqlite3"))
+    assert cache.get("resume a", "jd") is None
+    put(cache, "a")
+
+    assert cache.get("resume a", "jd") == {'scores': SCORES, 'matching': ["python"], 'missing': ["java"]}
+    assert cache.get("resume a", "other jd") is None
+
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['entries']) == (1, 2, 1)
+    assert stats['hit_rate'] == 1 / 3
+    cache.close()
+
+
+def test_entries_are_keyed_by_config_version(tmp_path, monkeypatch):
+    path = str(tmp_path / "cache.sqlite3")
+    cache = ScoreCache(path)
+    put(cache, "a")
+    cache.close()
+
+    monkeypatch.setattr(similarity, "SCORING_CONFIG", make_config(boosts=(0.0, 0.0, 0.0)))
+    changed = ScoreCache(path)
+    assert changed.config_version != cache.config_version
+    assert changed.get("resume a", "jd") is None
+
+    put(changed, "a")
+    assert changed.get("resume a", "jd") is not None
+    assert changed.stats()['entries'] == 2
+    changed.close()
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path, monkeypatch):
+    clock = itertools.count(1000)
+    monkeypatch.setattr(score_cache.time, "time", lambda: float(next(clock)))
+
+    size = len(json.dumps({'scores': SCORES, 'matching': ["python"], 'missing': ["java"]}))
+    cache = ScoreCache(str(tmp_path / "cache.sqlite3"), max_bytes=int(size * 3.5))
+    for name in "abc":
+        put(cache, name)
+
+    # Touch a, so b is now the least recently used; the buffered touch is
+    # written before eviction picks its victims
+    assert cache.get("resume a", "jd") is not None
+    put(cache, "d")
+
+    assert cache.get("resume b", "jd") is None
+    for name in "acd":
+        assert cache.get(f"resume {name}", "jd") is not None, name
+    assert cache.stats()['entries'] == 3
+    cache.close()
@@ -0,0 +1,70 @@
+import socket
+
+import pytest
+
+from sharding import ShardCoordinator, start_local_workers, stop_local_workers
+from streaming import stream_rank
+
+
+def unused_url():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    return f"http://127.0.0.1:{port}"
+
+
+class KillingCoordinator(ShardCoordinator):
+    """Kills one worker process just before its second shard is sent"""
+
+    def __init__(self, worker_urls, victim_url, victim_process, **options):
+        super().__init__(worker_urls, **options)
+        self.victim_url = victim_url
+        self.victim_process = victim_process
+        self.victim_posts = 0
+
+    def _post(self, url, body):
+        if url == self.victim_url:
+            self.victim_posts += 1
+            if self.victim_posts == 2:
+                self.victim_process.kill()
+                self.victim_process.join()
+        return super()._post(url, body)
+
+
+@pytest.fixture
+def workers():
+    processes, urls = start_local_workers(3)
+    yield processes, urls
+    stop_local_workers(processes)
+
+
+def test_sharded_ranking_survives_failed_workers(workers, resumes, jd_text):
+    processes, urls = workers
+    dead_url = unused_url()
+
+    coordinator = KillingCoordinator(
+        [dead_url] + urls, victim_url=urls[0], victim_process=processes[0], timeout=60
+    )
+    result = coordinator.rank(resumes, jd_text, k=10, shard_size=6)
+    expected = stream_rank(resumes, jd_text, k=10)
+
+    assert coordinator.victim_posts >= 2
+    assert result['dead_workers'] == sorted([dead_url, urls[0]])
+    assert result['shards'] == -(-len(resumes) // 6)
+
+    assert [(e['index'], e['resume_id']) for e in result['top']] == \
+        [(e['index'], e['resume_id']) for e in expected['top']]
+    assert [e['result']['scores']['combined_score'] for e in result['top']] == \
+        [e['result']['scores']['combined_score'] for e in expected['top']]
+    for key in ('total', 'scored', 'skipped', 'histogram', 'categories'):
+        assert result[key] == expected[key], key
+
+
+def test_sharded_ranking_of_empty_corpus_matches_stream_rank(workers, jd_text):
+    _, urls = workers
+    result = ShardCoordinator(urls).rank([], jd_text, k=10)
+    expected = stream_rank([], jd_text, k=10)
+
+    assert result['shards'] == 0
+    for key in ('top', 'total', 'scored', 'skipped', 'histogram', 'categories'):
+        assert result[key] == expected[key], key
@@ -0,0 +1,43 @@
+import pytest
+
+from pipeline import analyze_resume
+from shortlist import shortlist_top_k
+
+
+def exhaustive_ranking(resumes, jd_text):
+    """analyze_resume on every resume, best first, ties by input position"""
+    ranked = []
+    for index, (resume_id, text) in enumerate(resumes):
+        try:
+            result = analyze_resume(text, jd_text)
+        except ValueError:
+            continue
+        ranked.append((result['scores']['combined_score'], index, resume_id, result))
+    ranked.sort(key=lambda entry: (-entry[0], entry[1]))
+    return ranked
+
+
+@pytest.mark.parametrize("k", [1, 5, 10, 64, 100])
+def test_shortlist_matches_exhaustive_ranking(resumes, jd_text, k):
+    expected = exhaustive_ranking(resumes, jd_text)
+    shortlist, stats = shortlist_top_k(resumes, jd_text, k=k)
+
+    assert [(entry['index'], entry['resume_id']) for entry in shortlist] == \
+        [(index, resume_id) for _, index, resume_id, _ in expected[:k]]
+    for entry, (_, _, _, result) in zip(shortlist, expected):
+        assert entry['result'] == result
+
+    assert stats['skipped'] == 2
+    assert stats['candidates'] == len(expected)
+
+
+def test_shortlist_breaks_ties_by_position(resumes, jd_text):
+    expected = exhaustive_ranking(resumes, jd_text)
+    scores = [score for score, _, _, _ in expected]
+    # The corpus duplicates resume-3 twice; cut k right after its first copy
+    cut = next(i for i, (_, _, resume_id, _) in enumerate(expected) if resume_id == "resume-3") + 1
+    assert scores[cut - 1] == scores[cut]
+
+    shortlist, _ = shortlist_top_k(resumes, jd_text, k=cut)
+    assert shortlist[-1]['resume_id'] == "resume-3"
+    assert [entry['index'] for entry in shortlist] == [index for _, index, _, _ in expected[:cut]]
@@ -0,0 +1,23 @@
+from conftest import make_text, write_pdf
+from text_extraction import _page_ranges, extract_text_from_pdf
+
+
+def test_page_ranges_cover_every_page_in_order():
+    for page_count, num_ranges in [(10, 3), (7, 7), (41, 8), (5, 1)]:
+        ranges = _page_ranges(page_count, num_ranges)
+        assert len(ranges) == num_ranges
+        assert [page for start, end in ranges for page in range(start, end)] == list(range(page_count))
+        sizes = [end - start for start, end in ranges]
+        assert max(sizes) - min(sizes) <= 1
+
+
+def test_parallel_extraction_matches_serial_in_page_order(tmp_path):
+    pages = [f"page{number:03d} " + make_text(number, 30) for number in range(23)]
+    path = write_pdf(tmp_path / "long.pdf", pages)
+
+    serial = extract_text_from_pdf(path, parallel_threshold=len(pages) + 1)
+    parallel = extract_text_from_pdf(path, parallel_threshold=2, max_workers=3)
+
+    assert parallel == serial
+    markers = [word for word in parallel.split() if word.startswith("page")]
+    assert markers == [f"page{number:03d}" for number in range(23)]